@@ -1,13 +1,23 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import numpy as np
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
 from datetime import datetime
-import streamlit.components.v1 as components
-import time
-from streamlit_gsheets import GSheetsConnection  # Pastikan ini sudah di-import
+import json
+import uuid
+from auth import TokenSigner, UserExists, UserStore
+from charts import ANNUAL_TARGET, map_figure, sla_figure, target_figure, top_wilayah_figure, trend_figure
+from geocoding import Geocoder, NominatimBackend
+from cube import ComplaintCube
+from table import PAGE_SIZES, TableView
+from export import EXPORT_FORMATS, build_export, cached_export, filter_signature
+from perf import Profiler
+from report import REPORT_FORMATS, build_report, cached_report
+from spatial import MAP_LEVELS, aggregate_points, unlocated_count
+from data_sources import ExcelDirectorySource, GSheetsSource
+from settings import ADMIN_USERS, DATA_SOURCE, EXCEL_DIR
+from sla import build_sla_report
+from store import RefreshWorker, Snapshot, SnapshotStore, build_snapshot
+from sync import SheetSync
 
 
 # --- 1. KONFIGURASI HALAMAN ---
@@ -18,13 +28,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# --- 2. INISIALISASI SESSION STATE ---
-if 'logged_in' not in st.session_state:
-    st.session_state['logged_in'] = False
+# --- 2. AUTENTIKASI & SESI ---
+@st.cache_resource
+def get_auth():
+    # Tabel user (SQLite, scrypt) dan penanda tangan token dipakai bersama semua sesi
+    return UserStore(), TokenSigner()
 
-if 'users_db' not in st.session_state:
-    # Database sementara (Username: Password)
-    st.session_state['users_db'] = {"admin": "ombudsman123", "pimpinan": "rahasia123"}
+def current_user():
+    # Rerun hanya memverifikasi tanda tangan token, bukan password
+    return get_auth()[1].verify(st.session_state.get('auth_token'))
 
 # --- 3. CUSTOM CSS GLOBAL (TEMA TERANG CLEAN PROFESSIONAL) ---
 st.markdown("""
@@ -150,10 +162,9 @@ def auth_page():
                 password_login = st.text_input("Password", type="password", key="log_pass", placeholder="Masukkan password...")
                 
                 if st.button("Masuk", type="primary", use_container_width=True):
-                    if username_login in st.session_state['users_db'] and st.session_state['users_db'][username_login] == password_login:
-                        st.success("✅ Login berhasil! Memuat dashboard...")
-                        time.sleep(1)
-                        st.session_state['logged_in'] = True
+                    users, signer = get_auth()
+                    if users.verify(username_login, password_login):
+                        st.session_state['auth_token'] = signer.issue(username_login)
                         st.rerun()
                     else:
                         st.error("❌ Username atau password salah!")
@@ -169,68 +180,151 @@ def auth_page():
                         st.warning("⚠️ Semua kolom harus diisi!")
                     elif len(new_username) < 4 or len(new_password) < 4:
                         st.warning("⚠️ Username dan Password minimal 4 karakter.")
-                    elif new_username in st.session_state['users_db']:
-                        st.error("❌ Username sudah terdaftar! Pilih username lain.")
                     elif new_password != confirm_password:
                         st.error("❌ Password dan Konfirmasi Password tidak sama!")
                     else:
-                        st.session_state['users_db'][new_username] = new_password
-                        st.success("🎉 Akun berhasil dibuat! Silakan pindah ke tab 'Masuk (Login)'.")
-                        st.balloons()
-
-# --- 5. FUNGSI DASHBOARD UTAMA ---
-def show_dashboard():
-    def get_coordinates(df):
-        geolocator = Nominatim(user_agent="ombudsman_dash_v6_light")
-        geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
-        loc_col = 'Lokasi LM' if 'Lokasi LM' in df.columns else 'Terlapor'
-        unique_locations = df[loc_col].dropna().unique()
-        location_map = {}
-        progress_bar = st.progress(0, text="Sedang memetakan lokasi...")
-        for i, loc in enumerate(unique_locations):
-            try:
-                location = geocode(f"{loc}, Indonesia")
-                location_map[loc] = [location.latitude, location.longitude] if location else [-6.2088, 106.8456]
-            except:
-                location_map[loc] = [-6.2088, 106.8456]
-            progress_bar.progress((i + 1) / len(unique_locations))
-        progress_bar.empty()
-        df['lat'] = df[loc_col].map(lambda x: location_map.get(x, [-6.2088, 106.8456])[0])
-        df['lon'] = df[loc_col].map(lambda x: location_map.get(x, [-6.2088, 106.8456])[1])
-        return df
-    
-@st.cache_data(ttl=600)
-def load_data():
-    try:
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        df = conn.read(ttl=600)
-        df = df.dropna(how="all")
-        
-        date_col_found = False
-        for col in df.columns:
-            if any(x in col.lower() for x in ['tanggal', 'tgl', 'date']):
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-                df.rename(columns={col: 'Tanggal Laporan'}, inplace=True)
-                date_col_found = True
-                break
-                
-        return df, date_col_found
-
-    except Exception as e:
-        st.error(f"❌ Koneksi Database Terputus: {e}")
-        return pd.DataFrame(), False
-
-    if not data.empty and has_date:
-        today = datetime.now()
-        data['Hari_Berjalan'] = (today - data['Tanggal Laporan']).dt.days
-        # Pastikan kolom status ada sebelum filter
-        if 'Status' in data.columns:
-            mangkrak_mask = (data['Hari_Berjalan'] > 30) & (~data['Status'].str.contains('Selesai|Tutup', case=False, na=False))
-            total_mangkrak = len(data[mangkrak_mask])
+                        try:
+                            get_auth()[0].create(new_username, new_password)
+                        except UserExists:
+                            st.error("❌ Username sudah terdaftar! Pilih username lain.")
+                        else:
+                            st.success("🎉 Akun berhasil dibuat! Silakan pindah ke tab 'Masuk (Login)'.")
+                            st.balloons()
+
+# --- 5. FUNGSI DATA & GEOCODING ---
+def get_data_sources():
+    # Urutan prioritas: Google Sheet (snapshot Parquet, hanya baris baru/berubah yang di-parsing),
+    # lalu workbook Excel lokal sebagai cadangan saat sheet tidak bisa diakses
+    excel = ExcelDirectorySource(EXCEL_DIR)
+    if DATA_SOURCE == "excel":
+        return [("Workbook Lokal", excel)]
+    return [("Google Sheet", SheetSync(GSheetsSource(connection_name="gsheets"))), ("Workbook Lokal", excel)]
+
+@st.cache_resource
+def get_store():
+    # Satu store + worker per proses, dipakai bersama semua sesi. Worker memuat data, geocoding,
+    # dan membangun indeks/agregasi di latar belakang lalu menerbitkan snapshot berversi;
+    # rerun sesi hanya membaca snapshot terbaru tanpa menunggu sumber data.
+    store = SnapshotStore()
+    geocoder = Geocoder(backend=NominatimBackend(user_agent="ombudsman_dash_v6_light"))
+    sources = get_data_sources()
+    worker = RefreshWorker(store, lambda previous, prof: build_snapshot(sources, geocoder, previous, prof))
+    worker.start()
+    return store, worker
+
+def get_snapshot():
+    store, worker = get_store()
+    snapshot = store.current()
+    if snapshot is None:
+        # Hanya terjadi sekali setelah instalasi baru: belum ada snapshot di disk
+        with st.spinner("⏳ Menyiapkan data dashboard (memuat & memetakan lokasi)..."):
+            worker.wait_first_run()
+        snapshot = store.current()
+    if worker.last_error is not None:
+        if snapshot is None:
+            st.error(f"❌ Koneksi Database Terputus: {worker.last_error}")
         else:
-            total_mangkrak = len(data[data['Hari_Berjalan'] > 30])
-    else:
-        total_mangkrak = 0
+            st.warning(f"⚠️ Penyegaran data gagal ({worker.last_error}). Menampilkan data versi {snapshot.built_at}.")
+    if snapshot is None:
+        return Snapshot.empty()
+    if snapshot.notice:
+        st.warning(f"⚠️ {snapshot.notice}")
+    return snapshot
+
+@st.cache_data(max_entries=64)
+def get_map_cells(_df, view_sig, cell_deg):
+    # Hasil binning peta disimpan per kombinasi filter (view_sig) dan tingkat agregasi
+    return aggregate_points(_df, cell_deg), unlocated_count(_df)
+
+@st.cache_resource(max_entries=64)
+def get_sla_report(_df, view_sig, today):
+    # Backlog SLA per kombinasi filter (sama dengan laporan PDF); umur kasus berubah per hari
+    return build_sla_report(_df, today)
+
+@st.cache_resource(max_entries=128)
+def get_figure(kind, key, _build):
+    # Figure Plotly disimpan per (jenis grafik, versi data + filter); rerun dengan input sama
+    # tidak membangun ulang grafik. Dipakai bersama antar sesi karena kuncinya memuat versi data.
+    return _build()
+
+@st.fragment
+def render_map(data_filtered, view_sig, prof):
+    # Fragment: buka/tutup peta dan ganti tingkat agregasi hanya menjalankan ulang bagian ini
+    if not st.toggle("Tampilkan peta", value=True, key="show_map"):
+        return
+    # Laporan diagregasi per lokasi/sel grid: satu penanda per sel, bukan per laporan
+    map_level = st.selectbox("Agregasi peta:", list(MAP_LEVELS), key="map_level", label_visibility="collapsed")
+    with prof.stage("fig_peta", rows=len(data_filtered)):
+        map_cells, n_unlocated = get_map_cells(data_filtered, view_sig, MAP_LEVELS[map_level])
+        # Semua laporan terpilih tanpa koordinat: cukup keterangan di bawah, tanpa peta kosong
+        if not map_cells.empty:
+            fig_map = get_figure("peta", (view_sig, map_level), lambda: map_figure(map_cells))
+            st.plotly_chart(fig_map, use_container_width=True, config={'scrollZoom': True})
+    if n_unlocated:
+        st.caption(f"ℹ️ {n_unlocated} laporan tanpa lokasi yang dikenali tidak ditampilkan di peta.")
+
+@st.fragment
+def render_table(table, filtered_positions, view_sig, prof):
+    # Fragment: tabel hanya dibangun saat dibuka; urut/halaman/unduhan tidak menjalankan ulang dashboard
+    if not st.toggle("📚 Buka Detail Data Tabel", key="show_table"):
+        return
+    st.markdown('<div class="card-container" style="border-top: none; box-shadow: none;">', unsafe_allow_html=True)
+    c_sort, c_dir, c_size = st.columns([4, 2, 2])
+    sort_by = c_sort.selectbox("Urutkan berdasarkan:", ["(Urutan data)"] + table.columns)
+    sort_dir = c_dir.selectbox("Arah:", ["Naik", "Turun"])
+    page_size = c_size.selectbox("Baris per halaman:", PAGE_SIZES, index=1)
+
+    # Yang dikirim ke browser cukup satu halaman
+    with prof.stage("tabel"):
+        ordered = table.order(filtered_positions, None if sort_by == "(Urutan data)" else sort_by, sort_dir == "Naik")
+        n_pages = TableView.n_pages(len(ordered), page_size)
+        page = st.number_input(f"Halaman (1–{n_pages}):", min_value=1, max_value=n_pages, value=1, step=1)
+        st.dataframe(table.page(ordered, page, page_size), use_container_width=True, hide_index=True)
+    first_row = (page - 1) * page_size
+    st.caption(f"Menampilkan {first_row + 1}–{min(first_row + page_size, len(ordered))} dari {len(ordered)} laporan")
+
+    # File unduhan baru dibuat saat diminta, lalu disimpan per kombinasi filter
+    c_fmt, c_export = st.columns([3, 2])
+    export_fmt = c_fmt.selectbox("Format unduhan:", list(EXPORT_FORMATS), format_func=lambda f: EXPORT_FORMATS[f][0])
+    export_file = cached_export(view_sig, export_fmt)
+    if export_file is None and c_export.button("⚙️ Siapkan File Unduhan", use_container_width=True):
+        with st.spinner("Menyiapkan file..."):
+            export_file = build_export(lambda: table.rows(filtered_positions), export_fmt, view_sig)
+    if export_file is not None:
+        label, mime, ext = EXPORT_FORMATS[export_fmt]
+        with open(export_file, 'rb') as f:
+            c_export.download_button(f"📥 Unduh Data ({label})", data=f, file_name=f'Laporan_Ombudsman_{datetime.now().strftime("%Y%m%d")}.{ext}', mime=mime, use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def render_perf_panel(prof, snapshot):
+    # Panel khusus admin: rincian waktu (dan memori) per tahap rerun terakhir
+    history = st.session_state.setdefault('perf_history', [])
+    history.append(prof.to_dict())
+    del history[:-20]
+    with st.expander("⏱️ Instrumentasi Performa"):
+        st.caption(f"Snapshot data: versi {snapshot.version or '-'} · dibangun {snapshot.built_at}")
+        st.checkbox("Ukur memori (tracemalloc)", key="perf_track_memory", help="Berlaku mulai rerun berikutnya; menambah overhead.")
+        st.caption(f"Total rerun terukur: {prof.total() * 1000:.0f} ms")
+        st.dataframe(prof.to_frame(), use_container_width=True, hide_index=True)
+        # Muat data, geocoding, dan pembangunan indeks berjalan di worker latar, bukan di rerun
+        refresh_prof = get_store()[1].last_profile
+        if refresh_prof is not None:
+            st.caption(f"Penyegaran data terakhir (worker latar, {refresh_prof.started_at}): {refresh_prof.total() * 1000:.0f} ms")
+            st.dataframe(refresh_prof.to_frame(), use_container_width=True, hide_index=True)
+        if snapshot.memory is not None:
+            st.caption(f"Memori data: {len(snapshot.data)} baris, byte per baris sebelum/sesudah normalisasi kolom")
+            st.dataframe(snapshot.memory, use_container_width=True)
+        st.download_button("📥 Unduh JSON (20 rerun terakhir)", data=json.dumps(history, default=str, indent=2), file_name="perf_dashboard.json", mime="application/json", use_container_width=True)
+
+# --- 6. FUNGSI DASHBOARD UTAMA ---
+def show_dashboard(username):
+    session_id = st.session_state.setdefault('perf_session', uuid.uuid4().hex)
+    prof = Profiler(track_memory=st.session_state.get('perf_track_memory', False), label="rerun", owner=session_id)
+    with prof.stage("snapshot"):
+        snapshot = get_snapshot()
+    data, has_date, data_version = snapshot.data, snapshot.has_date, snapshot.version
+
+    today = datetime.now().date()
 
     # SIDEBAR
     with st.sidebar:
@@ -240,58 +334,84 @@ def load_data():
             st.markdown("<h2 style='color:#003366;'>⚖️ Ombudsman</h2>", unsafe_allow_html=True)
         
         st.markdown("### 🔎 Pencarian & Filter")
-        search_query = st.text_input("Cari Data:", placeholder="Nama/No/Wilayah...")
+        search_query = st.text_input("Cari Data:", placeholder="Nama/No/Wilayah... atau Asisten:nama", help="Gunakan Kolom:kata untuk mencari di satu kolom (mis. Asisten:budi) dan akhiri dengan * untuk pencarian awalan.")
         st.divider()
 
         start_date, end_date = None, None
-        data_filtered = data.copy()
+        engine = snapshot.filter_engine
+        def search(query):
+            with prof.stage("search"):
+                return snapshot.search_index.search(query)
+        active_filters = {}
 
-        with st.sidebar:
-    # ... (kode logo dan menu navigasi abang yang lain) ...
-    
-            st.markdown("---")
         if st.button("🔄 Tarik Data Terbaru", use_container_width=True):
-            st.cache_data.clear() # Menghapus cache lama
-        st.rerun() # Refresh halaman
+            with st.spinner("Menarik data terbaru..."):
+                get_store()[1].refresh(wait=True) # Worker membangun & menerbitkan snapshot baru
+            st.rerun() # Refresh halaman
 
         # Perbaikan bug tuple pada date_input
-        if has_date:
-            min_date, max_date = data['Tanggal Laporan'].min().date(), data['Tanggal Laporan'].max().date()
+        if has_date and engine.dates is not None and len(engine.dates.sorted_dates):
+            min_date = pd.Timestamp(engine.dates.sorted_dates[0]).date()
+            max_date = pd.Timestamp(engine.dates.sorted_dates[-1]).date()
             if min_date != max_date:
                 date_range = st.date_input("📅 Periode Laporan", value=(min_date, max_date), min_value=min_date, max_value=max_date)
                 if len(date_range) == 2:
                     start_date, end_date = date_range
-                    data_filtered = data_filtered[(data_filtered['Tanggal Laporan'].dt.date >= start_date) & (data_filtered['Tanggal Laporan'].dt.date <= end_date)]
-
-        if search_query:
-            mask = data_filtered.astype(str).apply(lambda x: x.str.contains(search_query, case=False)).any(axis=1)
-            data_filtered = data_filtered[mask]
+                    active_filters.update(start=start_date, end=end_date)
 
+        # Pilihan tiap selectbox mengikuti hasil filter sebelumnya (bertingkat), dijawab dari indeks
         if 'Asisten' in data.columns:
-            asisten_list = ["Semua Asisten"] + sorted(data_filtered["Asisten"].dropna().unique().tolist())
+            asisten_list = ["Semua Asisten"] + engine.options("Asisten", engine.select(query=search_query, search=search, **active_filters))
             sel_asisten = st.selectbox("👤 Asisten:", asisten_list)
-            if sel_asisten != "Semua Asisten": data_filtered = data_filtered[data_filtered["Asisten"] == sel_asisten]
+            if sel_asisten != "Semua Asisten":
+                active_filters["Asisten"] = sel_asisten
 
         if 'Lokasi LM' in data.columns:
-            wilayah_list = ["Semua Wilayah"] + sorted(data_filtered["Lokasi LM"].dropna().unique().tolist())
+            wilayah_list = ["Semua Wilayah"] + engine.options("Lokasi LM", engine.select(query=search_query, search=search, **active_filters))
             sel_wilayah = st.selectbox("📍 Wilayah LM:", wilayah_list)
-            if sel_wilayah != "Semua Wilayah": data_filtered = data_filtered[data_filtered["Lokasi LM"] == sel_wilayah]
+            if sel_wilayah != "Semua Wilayah":
+                active_filters["Lokasi LM"] = sel_wilayah
                 
         if 'Status' in data.columns:
-            status_list = ["Semua Status"] + sorted(data_filtered["Status"].dropna().unique().tolist())
+            status_list = ["Semua Status"] + engine.options("Status", engine.select(query=search_query, search=search, **active_filters))
             sel_status = st.multiselect("📊 Status:", status_list, default="Semua Status")
             if "Semua Status" not in sel_status and sel_status: 
-                data_filtered = data_filtered[data_filtered["Status"].isin(sel_status)]
+                active_filters["Status"] = sel_status
+
+        # Satu kali pengambilan baris di akhir, tanpa salinan DataFrame per langkah filter
+        with prof.stage("filter"):
+            filtered_positions = engine.select(query=search_query, search=search, **active_filters)
+            data_filtered = data.iloc[filtered_positions]
+        # Tanda tangan tampilan saat ini: kunci cache turunan per kombinasi filter (peta, unduhan)
+        view_sig = filter_signature(data_version, search_query, sorted(active_filters.items()))
+        # "Lewat SLA" dan backlog mengikuti filter yang sama dengan KPI (dan laporan PDF)
+        with prof.stage("sla"):
+            if search_query or active_filters:
+                sla_report = get_sla_report(data_filtered, view_sig, today)
+            else:
+                sla_report = snapshot.sla_report(today)
+        total_mangkrak = sla_report.overdue
 
         st.markdown("---")
-        if st.button("🖨️ Cetak PDF", type="primary", use_container_width=True):
-            st.components.v1.html("""<script>setTimeout(function() {window.parent.print();}, 100);</script>""", height=0, width=0)
+        # Laporan PDF dibuat di server (matplotlib) dengan filter yang sama seperti tampilan, disimpan per versi data
+        if not data.empty:
+            report_filters = dict(asisten=active_filters.get('Asisten'), wilayah=active_filters.get('Lokasi LM'),
+                                  start=active_filters.get('start'), end=active_filters.get('end'),
+                                  status=active_filters.get('Status'), query=search_query)
+            report_file = cached_report(data_version, today, **report_filters)
+            if report_file is None and st.button("🖨️ Siapkan Laporan PDF", type="primary", use_container_width=True):
+                with st.spinner("Menyusun laporan..."):
+                    report_file = build_report(snapshot, today, **report_filters)
+            if report_file is not None:
+                with open(report_file, 'rb') as f:
+                    st.download_button("📄 Unduh Laporan PDF", data=f, file_name=f'Laporan_Ombudsman_{today.strftime("%Y%m%d")}.pdf', mime=REPORT_FORMATS['pdf'][1], type="primary", use_container_width=True)
         
         if st.button("🚪 Keluar / Logout", use_container_width=True):
-            st.session_state['logged_in'] = False
+            st.session_state.pop('auth_token', None)
             st.rerun()
             
         st.caption("© 2026 Keasistenan Utama IV")
+        perf_slot = st.container() if username in ADMIN_USERS else None
 
     # MAIN CONTENT DASHBOARD
     st.markdown("""
@@ -308,41 +428,43 @@ def load_data():
         st.markdown(f"<div style='background-color:#e3edf7; border: 1px solid #d1e5f7; padding:10px; border-radius:8px; margin-bottom:20px; color:#003366;'>ℹ️ Filter Aktif: {' | '.join(filter_info)}</div>", unsafe_allow_html=True)
 
     if not data_filtered.empty:
-        total = len(data_filtered)
-        selesai = len(data_filtered[data_filtered['Status'].str.contains('Selesai|Tutup', case=False, na=False)]) if 'Status' in data_filtered.columns else 0
+        # KPI & grafik dijawab dari cube (jumlah per sel), bukan memindai ulang baris.
+        # Pencarian teks tidak bisa dipetakan ke sel cube, jadi cube dibangun dari hasil filter.
+        with prof.stage("kpi_cube"):
+            if search_query:
+                kpi_cube = ComplaintCube.from_frame(data_filtered, has_date)
+            else:
+                kpi_cube = snapshot.cube.filter(**active_filters)
+        total = kpi_cube.total()
+        selesai = kpi_cube.selesai()
         proses = total - selesai
         
         col1, col2, col3, col4 = st.columns(4)
         col1.metric("Total Laporan", f"{total}", delta="Kasus Masuk")
         col2.metric("Selesai", f"{selesai}", f"{(selesai/total*100 if total>0 else 0):.1f}% Rate")
         col3.metric("Dalam Proses", f"{proses}", delta_color="inverse")
-        col4.metric("🎯 Target", "10", delta="Tahunan") 
+        col4.metric("🎯 Target", f"{ANNUAL_TARGET}", delta="Tahunan") 
 
         st.markdown('<div class="card-container card-blue">', unsafe_allow_html=True)
+        # Figure hanya dibangun bila (versi data, filter) berubah; selain itu diambil dari cache
+        fig_trend = None
         if has_date:
             st.markdown("#### 📉 Tren Laporan Masuk (Bulanan)")
-            trend_data = data_filtered.set_index('Tanggal Laporan').resample('ME').size().reset_index(name='Jumlah Laporan')
-            if not trend_data.empty:
-                fig_trend = px.line(trend_data, x='Tanggal Laporan', y='Jumlah Laporan', markers=True, line_shape='spline')
-                fig_trend.update_traces(line_color='#004a99', line_width=3, marker=dict(size=8, color='#e65100'))
-                fig_trend.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', height=300, xaxis_title=None, yaxis_title="Jumlah Kasus")
-                st.plotly_chart(fig_trend, use_container_width=True)
+            with prof.stage("fig_tren"):
+                fig_trend = get_figure("tren", view_sig, lambda: trend_figure(kpi_cube.monthly_trend(), 'Tanggal Laporan'))
         elif 'Tahun' in data_filtered.columns:
             st.markdown("#### 📉 Tren Laporan Masuk (Tahunan)")
-            trend_data = data_filtered.groupby('Tahun').size().reset_index(name='Jumlah Laporan')
-            if not trend_data.empty:
-                fig_trend = px.line(trend_data, x='Tahun', y='Jumlah Laporan', markers=True)
-                fig_trend.update_xaxes(type='category')
-                fig_trend.update_traces(line_color='#004a99', line_width=3, marker=dict(size=8, color='#e65100'))
-                fig_trend.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', height=300, xaxis_title=None, yaxis_title="Jumlah Kasus")
-                st.plotly_chart(fig_trend, use_container_width=True)
+            with prof.stage("fig_tren"):
+                fig_trend = get_figure("tren", view_sig, lambda: trend_figure(kpi_cube.by_year(), 'Tahun'))
+        if fig_trend is not None:
+            st.plotly_chart(fig_trend, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
         with st.container():
             c_map, c_sum = st.columns([7, 3])
             with c_sum:
                 st.markdown('<div class="card-container card-orange"><h4>📝 Ringkasan Eksekutif</h4>', unsafe_allow_html=True)
-                top_wilayah = data_filtered['Lokasi LM'].mode()[0] if 'Lokasi LM' in data_filtered.columns else "-"
+                top_wilayah = kpi_cube.mode('Lokasi LM')
                 rate = (selesai / total * 100) if total > 0 else 0
                 evaluasi = "Sangat Baik" if rate > 80 else "Cukup Baik" if rate > 50 else "Perlu Atensi"
                 color_eval = "#059669" if rate > 80 else "#d97706" if rate > 50 else "#dc2626" 
@@ -358,16 +480,7 @@ def load_data():
             with c_map:
                 st.markdown('<div class="card-container card-blue"><h4>📍 Peta Distribusi</h4>', unsafe_allow_html=True)
                 if 'lat' in data_filtered.columns:
-                    # Perbaikan: Cek kolom status agar tidak crash
-                    color_col = 'Status' if 'Status' in data_filtered.columns else None
-                    hover_col = 'Lokasi LM' if 'Lokasi LM' in data_filtered.columns else None
-                    
-                    fig_map = px.scatter_mapbox(
-                        data_filtered, lat='lat', lon='lon', color=color_col, size_max=15, zoom=3.5,
-                        hover_name=hover_col, mapbox_style="carto-positron" 
-                    )
-                    fig_map.update_layout(paper_bgcolor='rgba(0,0,0,0)', height=400, margin={"r":0,"t":0,"l":0,"b":0}, dragmode="pan")
-                    st.plotly_chart(fig_map, use_container_width=True, config={'scrollZoom': True})
+                    render_map(data_filtered, view_sig, prof)
                 st.markdown('</div>', unsafe_allow_html=True)
 
         st.markdown('<div class="card-container card-blue">', unsafe_allow_html=True)
@@ -376,45 +489,41 @@ def load_data():
         with row_chart1:
             st.subheader("📊 Wilayah Laporan Terbanyak")
             if 'Lokasi LM' in data_filtered.columns:
-                top_chart = data_filtered['Lokasi LM'].value_counts().nlargest(10).reset_index()
-                top_chart.columns = ['Wilayah', 'Jumlah']
-                fig_bar = px.bar(top_chart, x='Jumlah', y='Wilayah', orientation='h', text='Jumlah', color='Jumlah', color_continuous_scale=['#a6c9e2', '#004a99'])
-                fig_bar.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', xaxis_title=None, yaxis_title=None, yaxis=dict(autorange="reversed"), height=350, coloraxis_showscale=False)
-                st.plotly_chart(fig_bar, use_container_width=True)
-
+                with prof.stage("fig_wilayah"):
+                    fig_bar = get_figure("wilayah", view_sig, lambda: top_wilayah_figure(kpi_cube.top('Lokasi LM', 10)))
+                    st.plotly_chart(fig_bar, use_container_width=True)
         with row_chart2:
             st.subheader("📊 Pencapaian Target")
             if 'Tahun' in data_filtered.columns or has_date:
-                temp_df = data_filtered.copy()
-                if 'Tahun' not in temp_df.columns:
-                    temp_df['Tahun'] = temp_df['Tanggal Laporan'].dt.year
-                target_df = temp_df.groupby('Tahun').size().reset_index(name='Realisasi')
-                target_df['Target'] = 10 
-                target_df['Tahun'] = target_df['Tahun'].astype(str)
-                fig_target = px.bar(target_df, x='Tahun', y=['Realisasi', 'Target'], barmode='group', color_discrete_map={'Realisasi': '#004a99', 'Target': '#e65100'})
-                fig_target.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', height=350, xaxis_title=None, yaxis_title="Jumlah Kasus", legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
-                st.plotly_chart(fig_target, use_container_width=True)
+                with prof.stage("fig_target"):
+                    fig_target = get_figure("target", view_sig, lambda: target_figure(kpi_cube.by_year('Realisasi')))
+                    st.plotly_chart(fig_target, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
-        with st.expander("📚 Buka Detail Data Tabel", expanded=True):
-            st.markdown('<div class="card-container" style="border-top: none; box-shadow: none;">', unsafe_allow_html=True)
-            kolom_dihapus = ['lat', 'lon', 'Hari_Berjalan', 'ni', 'Ni', 'NI', 'maladministrasi', 'Maladministrasi', 'Jenis Maladministrasi']
-            view_df = data_filtered.drop(columns=kolom_dihapus, errors='ignore')
-            
-            preferred_cols = ['Nomor Arsip', 'Nama Pelapor', 'Lokasi LM', 'Asisten', 'Status', 'Tanggal Laporan', 'Tahun']
-            existing_cols = [c for c in preferred_cols if c in view_df.columns]
-            other_cols = [c for c in view_df.columns if c not in existing_cols]
-            
-            st.dataframe(view_df[existing_cols + other_cols], use_container_width=True)
-            
-            csv = view_df.to_csv(index=False).encode('utf-8')
-            st.download_button("📥 Unduh Data (CSV)", data=csv, file_name=f'Laporan_Ombudsman_{datetime.now().strftime("%Y%m%d")}.csv', mime='text/csv')
+        if sla_report.open_cases:
+            st.markdown('<div class="card-container card-orange">', unsafe_allow_html=True)
+            st.subheader("⏳ Umur Backlog Laporan (SLA)")
+            c_sla_tab, c_sla_chart = st.columns([4, 6])
+            with c_sla_tab:
+                st.dataframe(sla_report.backlog, use_container_width=True)
+            with c_sla_chart:
+                with prof.stage("fig_sla"):
+                    # Backlog SLA ikut filter sidebar: kuncinya tampilan (versi data + filter) + tanggal hari ini
+                    fig_sla = get_figure("sla", (view_sig, today), lambda: sla_figure(sla_report.backlog, sla_report.bucket_labels))
+                    st.plotly_chart(fig_sla, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
+
+        render_table(snapshot.table_view, filtered_positions, view_sig, prof)
     else:
         st.warning("⚠️ Data tidak ditemukan. Silakan atur ulang kata kunci pencarian atau filter tanggal.")
 
-# --- 6. ROUTING UTAMA ---
-if not st.session_state['logged_in']:
+    if perf_slot is not None:
+        with perf_slot:
+            render_perf_panel(prof, snapshot)
+
+# --- 7. ROUTING UTAMA ---
+username = current_user()
+if username is None:
     auth_page()
 else:
-    show_dashboard()
\ No newline at end of file
+    show_dashboard(username)
\ No newline at end of file
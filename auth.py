@@ -0,0 +1,142 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+from settings import SCRYPT_N, SESSION_TTL_HOURS, cache_path
+
+# Akun awal, hanya dibuat bila tabel user masih kosong (sama dengan users_db lama)
+DEFAULT_USERS = {"admin": "ombudsman123", "pimpinan": "rahasia123"}
+SCRYPT_R = 8
+SCRYPT_P = 1
+HASH_BYTES = 32
+# Hash password dan kunci token hanya boleh dibaca pemilik proses
+PRIVATE_MODE = 0o600
+
+
+class UserExists(ValueError):
+    pass
+
+
+def private_file(path):
+    # Buat file (bila belum ada) langsung dengan mode 0600, dan rapatkan file lama yang terlanjur terbuka
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT, PRIVATE_MODE))
+    os.chmod(path, PRIVATE_MODE)
+    return path
+
+
+def hash_password(password, salt=None, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    salt = salt or os.urandom(16)
+    digest = hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                            maxmem=256 * n * r, dklen=HASH_BYTES)
+    return salt, digest
+
+
+class UserStore:
+    # Tabel user di SQLite; password disimpan sebagai scrypt bergaram beserta parameter biayanya,
+    # sehingga SCRYPT_N bisa dinaikkan tanpa mematahkan akun lama (di-hash ulang saat login berikutnya)
+    def __init__(self, path=None, n=SCRYPT_N, seed=DEFAULT_USERS):
+        self.path = path or cache_path("users.sqlite3")
+        self.n = n
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(private_file(self.path)), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, salt BLOB, hash BLOB, "
+            "n INTEGER, r INTEGER, p INTEGER, created_at REAL)"
+        )
+        self._conn.commit()
+        if seed and not self.count():
+            for username, password in seed.items():
+                self.create(username, password)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def exists(self, username):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is not None
+
+    def create(self, username, password):
+        salt, digest = hash_password(password, n=self.n)
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("INSERT INTO users VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   (username, salt, digest, self.n, SCRYPT_R, SCRYPT_P, time.time()))
+        except sqlite3.IntegrityError:
+            raise UserExists(username) from None
+
+    def verify(self, username, password):
+        with self._lock:
+            row = self._conn.execute("SELECT salt, hash, n, r, p FROM users WHERE username = ?", (username,)).fetchone()
+        if row is None:
+            # Tetap hitung hash agar waktu respons tidak membocorkan apakah username terdaftar
+            hash_password(password, n=self.n)
+            return False
+        salt, digest, n, r, p = row
+        if not hmac.compare_digest(hash_password(password, salt, n, r, p)[1], digest):
+            return False
+        if (n, r, p) != (self.n, SCRYPT_R, SCRYPT_P):
+            salt, digest = hash_password(password, n=self.n)
+            with self._lock, self._conn:
+                self._conn.execute("UPDATE users SET salt = ?, hash = ?, n = ?, r = ?, p = ? WHERE username = ?",
+                                   (salt, digest, self.n, SCRYPT_R, SCRYPT_P, username))
+        return True
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode('ascii')
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def load_secret():
+    # Kunci penanda tangan token: environment variable, atau dibuat sekali dan disimpan di cache
+    secret = os.environ.get("OMBUDSMAN_SECRET_KEY")
+    if secret:
+        return secret.encode('utf-8')
+    path = cache_path("session.key")
+    if not path.exists():
+        tmp = private_file(path.with_suffix(".tmp"))
+        tmp.write_bytes(secrets.token_bytes(32))
+        os.replace(tmp, path)
+    os.chmod(path, PRIVATE_MODE)
+    return path.read_bytes()
+
+
+class TokenSigner:
+    # Token sesi = username + waktu kedaluwarsa, ditandatangani HMAC-SHA256.
+    # Rerun cukup memeriksa token (mikrodetik), bukan menghitung ulang scrypt.
+    def __init__(self, secret=None, ttl_hours=SESSION_TTL_HOURS):
+        self.secret = secret or load_secret()
+        self.ttl = ttl_hours * 3600
+
+    def _sign(self, payload):
+        return _b64(hmac.new(self.secret, payload, hashlib.sha256).digest())
+
+    def issue(self, username, now=None):
+        expires = int((now or time.time()) + self.ttl)
+        payload = f"{username}|{expires}".encode('utf-8')
+        return f"{_b64(payload)}.{self._sign(payload)}"
+
+    def verify(self, token, now=None):
+        # Mengembalikan username bila token sah dan belum kedaluwarsa, selain itu None
+        if not token or token.count(".") != 1:
+            return None
+        body, signature = token.split(".")
+        try:
+            payload = _unb64(body)
+        except ValueError:
+            return None
+        if not hmac.compare_digest(self._sign(payload), signature):
+            return None
+        username, _, expires = payload.decode('utf-8').rpartition("|")
+        if not expires.isdigit() or int(expires) < (now or time.time()):
+            return None
+        return username
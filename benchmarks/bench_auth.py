@@ -0,0 +1,45 @@
+# Benchmark login: jalur kredensial (scrypt) per tingkat biaya vs pemeriksaan token sesi per rerun
+# Jalankan: python benchmarks/bench_auth.py [scrypt_N ...] [--threads T] [--logins L]
+import argparse
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from auth import TokenSigner, UserStore  # noqa: E402
+
+
+def throughput(fn, count, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda _: fn(), range(count)))
+    elapsed = time.perf_counter() - start
+    return count / elapsed, elapsed / count, results
+
+
+def main(costs, threads, logins):
+    print(f"{'jalur':>18} {'N':>8} {'thread':>7} {'per detik':>12} {'latensi':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in costs:
+            users = UserStore(Path(tmp) / f"users_{n}.sqlite3", n=n, seed={'admin': 'ombudsman123'})
+            rate, latency, ok = throughput(lambda: users.verify('admin', 'ombudsman123'), logins, threads)
+            assert all(ok)
+            print(f"{'login (scrypt)':>18} {n:>8} {threads:>7} {rate:>12.1f} {latency * 1000:>9.2f}ms")
+
+    signer = TokenSigner(secret=b"benchmark")
+    token = signer.issue('admin')
+    count = logins * 1000
+    rate, latency, ok = throughput(lambda: signer.verify(token), count, 1)
+    assert all(u == 'admin' for u in ok)
+    print(f"{'rerun (token)':>18} {'-':>8} {1:>7} {rate:>12.0f} {latency * 1e6:>9.2f}us")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('costs', nargs='*', type=int, default=[2 ** 13, 2 ** 14, 2 ** 15])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--logins', type=int, default=40)
+    args = parser.parse_args()
+    main(args.costs, args.threads, args.logins)
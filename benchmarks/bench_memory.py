@@ -0,0 +1,35 @@
+# Laporan memori: byte per baris data mentah (kolom object seperti hasil sheet) vs setelah compact_frame
+# Jalankan: python benchmarks/bench_memory.py [jumlah_baris ...]
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from columnar import compact_frame, memory_report  # noqa: E402
+from synthetic import make_dataset, value_pools  # noqa: E402
+
+
+def as_loaded(df):
+    # Bentuk data sebelum normalisasi: semua kolom teks sebagai object Python
+    text = [c for c in df.columns if pd.api.types.is_string_dtype(df[c].dtype)]
+    return df.astype({c: object for c in text})
+
+
+def main(sizes):
+    pools = value_pools()
+    for n in sizes:
+        raw = as_loaded(make_dataset(n, pools=pools))
+        start = time.perf_counter()
+        compact = compact_frame(raw)
+        elapsed = time.perf_counter() - start
+        report = memory_report(raw, compact)
+        total = report.loc['Total']
+        print(f"\n== {n:,} baris: {total['Byte/Baris Awal']:.1f} -> {total['Byte/Baris Ringkas']:.1f} byte/baris "
+              f"({total['Byte/Baris Awal'] / total['Byte/Baris Ringkas']:.1f}x), normalisasi {elapsed:.3f}s ==")
+        print(report.to_string())
+
+
+if __name__ == '__main__':
+    main([int(x) for x in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,110 @@
+# Benchmark headless jalur data dashboard (tanpa Streamlit) pada data sintetis.
+# Jalankan:
+#   python benchmarks/bench_pipeline.py                       -> 1k, 10k, 100k, 1M baris
+#   python benchmarks/bench_pipeline.py 1000 10000 --save base.json
+#   python benchmarks/bench_pipeline.py 1000 10000 --compare base.json --tolerance 1.5
+import argparse
+import json
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from columnar import compact_frame  # noqa: E402
+from cube import ComplaintCube  # noqa: E402
+from export import iter_csv  # noqa: E402
+from filters import FilterEngine  # noqa: E402
+from geocoding import GeocodeCache, Geocoder, StaticBackend, add_coordinates  # noqa: E402
+from perf import Profiler  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+from sla import build_sla_report  # noqa: E402
+from spatial import aggregate_points  # noqa: E402
+from synthetic import make_dataset, value_pools  # noqa: E402
+from table import TableView  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+TODAY = date(2026, 1, 1)
+
+
+def run_pipeline(df, prof, workdir):
+    with prof.stage('compact'):
+        df = compact_frame(df)
+    with prof.stage('geocoding'):
+        # Backend offline -> semua lokasi dijawab gazetteer bawaan
+        geocoder = Geocoder(cache=GeocodeCache(Path(workdir) / 'geocode.sqlite'), backend=StaticBackend(offline=True))
+        df = add_coordinates(df, geocoder)
+    with prof.stage('search_index'):
+        index = SearchIndex(df.drop(columns=['lat', 'lon']))
+    with prof.stage('filter_engine'):
+        engine = FilterEngine(df)
+    with prof.stage('cube'):
+        cube = ComplaintCube.from_frame(df, True, engine)
+    with prof.stage('sla'):
+        build_sla_report(df, TODAY)
+
+    asisten = df['Asisten'].iloc[0]
+    filters = dict(start=date(2023, 1, 1), end=date(2024, 6, 30), Asisten=asisten)
+    with prof.stage('search'):
+        index.search('bogor')
+    with prof.stage('filter_select'):
+        engine.select(query='bogor', search=index.search, **filters)
+    with prof.stage('kpi'):
+        sub = cube.filter(**filters)
+        sub.total(), sub.selesai(), sub.monthly_trend(), sub.top('Lokasi LM'), sub.by_year(), sub.mode('Lokasi LM')
+    with prof.stage('map_cells'):
+        aggregate_points(df.iloc[engine.select(**filters)], 0.5)
+    with prof.stage('table_page'):
+        table = TableView(df)
+        table.page(table.order(engine.select(**filters), 'Tanggal Laporan', False), 1, 50)
+    selected = engine.select(**filters)
+    with prof.stage('export_csv', rows=len(selected)):
+        sum(len(part) for part in iter_csv(table.rows(selected)))
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, seconds in results.items():
+        base = baseline.get(key)
+        if base and seconds > base * tolerance and seconds - base > 0.005:
+            regressions.append(f"{key}: {base * 1000:.1f} ms -> {seconds * 1000:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark jalur data dashboard")
+    parser.add_argument('sizes', nargs='*', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--memory', action='store_true', help="ukur puncak memori per tahap (lebih lambat)")
+    parser.add_argument('--save', help="simpan hasil sebagai JSON")
+    parser.add_argument('--compare', help="bandingkan dengan JSON hasil --save sebelumnya")
+    parser.add_argument('--tolerance', type=float, default=1.5, help="batas rasio waktu sebelum dianggap regresi")
+    args = parser.parse_args()
+
+    pools = value_pools()
+    results, report = {}, []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            df = make_dataset(n, pools=pools)
+            prof = Profiler(track_memory=args.memory, label=f"{n} baris")
+            run_pipeline(df, prof, workdir)
+            report.append(prof.to_dict())
+            print(f"\n== {n:,} baris (total {prof.total():.3f}s) ==")
+            print(prof.to_frame().to_string(index=False))
+            results.update({f"{n}/{r['stage']}": r['seconds'] for r in prof.records})
+
+    if args.save:
+        Path(args.save).write_text(json.dumps({'results': results, 'runs': report}, default=str, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESI:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\nTidak ada regresi dibanding baseline.")
+
+
+if __name__ == '__main__':
+    np.seterr(all='ignore')
+    main()
@@ -0,0 +1,40 @@
+# Benchmark pencarian: mask astype(str).contains lama vs SearchIndex
+# Jalankan: python benchmarks/bench_search.py [jumlah_baris ...]
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from search_index import SearchIndex  # noqa: E402
+from synthetic import make_dataset  # noqa: E402
+
+QUERIES = ['bogor', 'de', 'LM/XI/2023', 'Asisten:sigit', 'tidak-ada']
+
+
+def old_mask(df, query):
+    return df.astype(str).apply(lambda x: x.str.contains(query, case=False)).any(axis=1)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'baris':>9} {'kueri':>14} {'mask lama':>11} {'index':>9}")
+    for n in sizes:
+        df = make_dataset(n)
+        index, build = timed(lambda: SearchIndex(df))
+        print(f"{n:>9} {'(bangun)':>14} {'':>11} {build:>8.3f}s")
+        for q in QUERIES:
+            old = ''
+            if ':' not in q:
+                _, t_old = timed(lambda: old_mask(df, q))
+                old = f"{t_old:.3f}s"
+            _, t_new = timed(lambda: index.search(q))
+            print(f"{n:>9} {q:>14} {old:>11} {t_new:>8.4f}s")
+
+
+if __name__ == '__main__':
+    main([int(x) for x in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
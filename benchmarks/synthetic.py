@@ -0,0 +1,45 @@
+# Generator data pengaduan sintetis mengikuti skema data_tanah.xlsx / data_tanah1.xlsx
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+SCHEMA_FILES = [ROOT / 'data_tanah.xlsx', ROOT / 'data_tanah1.xlsx']
+ROMAWI = np.array(['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X', 'XI', 'XII'])
+KANTOR = np.array(['JKT', 'SBY', 'BDL', 'MKS', 'MDN'])
+
+
+def value_pools(files=SCHEMA_FILES):
+    # Kumpulan nilai per kolom diambil dari workbook contoh
+    frames = [pd.read_excel(f) for f in files if Path(f).exists()]
+    data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    pools = {col: data[col].dropna().astype(str).unique() for col in data.columns}
+    pools['Status'] = np.union1d(pools.get('Status', []), ['Selesai', 'Tutup', 'Berproses'])
+    return pools
+
+
+def _pick(rng, pool, n, skew=1.1):
+    # Distribusi condong (mirip Zipf): beberapa wilayah/asisten jauh lebih sering muncul
+    weights = 1.0 / np.arange(1, len(pool) + 1) ** skew
+    return np.asarray(pool)[rng.choice(len(pool), size=n, p=weights / weights.sum())]
+
+
+def make_dataset(n, seed=0, pools=None):
+    pools = pools if pools is not None else value_pools()
+    rng = np.random.default_rng(seed)
+    tanggal = pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 6 * 365, n), unit='D')
+    tahun = tanggal.year.to_numpy()
+    return pd.DataFrame({
+        'Tahun': tahun,
+        'Nomor Arsip': [f"{no:04d}/LM/{b}/{t}/{k}" for no, b, t, k in zip(
+            rng.integers(1, 9999, n), ROMAWI[tanggal.month.to_numpy() - 1], tahun, KANTOR[rng.integers(0, len(KANTOR), n)])],
+        'Nama Pelapor': [f"Pelapor {i}" for i in rng.integers(0, max(n // 2, 1), n)],
+        'Lokasi LM': _pick(rng, pools['Lokasi LM'], n),
+        'Asisten': _pick(rng, pools['Asisten'], n, skew=0.3),
+        'Status': _pick(rng, pools['Status'], n, skew=0.5),
+        'Terlapor': _pick(rng, pools['Terlapor'], n),
+        'Maladministrasi': _pick(rng, pools['Maladministrasi'], n),
+        'Tanggal Laporan': tanggal,
+        'Provinsi': _pick(rng, pools['Provinsi'], n),
+    })
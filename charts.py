@@ -0,0 +1,53 @@
+import plotly.express as px
+
+# Pembuat figure Plotly dashboard. Fungsi murni (tanpa pemanggilan Streamlit) agar hasilnya bisa
+# disimpan per (versi data, filter) dan dipakai ulang; mengembalikan None bila tidak ada data.
+TRANSPARENT = dict(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+H_LEGEND = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+# Target jumlah laporan selesai per tahun (kartu KPI, grafik target, laporan PDF)
+ANNUAL_TARGET = 10
+
+
+def trend_figure(trend_data, x):
+    if trend_data.empty:
+        return None
+    if x == 'Tahun':
+        fig = px.line(trend_data, x=x, y='Jumlah Laporan', markers=True)
+        fig.update_xaxes(type='category')
+    else:
+        fig = px.line(trend_data, x=x, y='Jumlah Laporan', markers=True, line_shape='spline')
+    fig.update_traces(line_color='#004a99', line_width=3, marker=dict(size=8, color='#e65100'))
+    fig.update_layout(**TRANSPARENT, height=300, xaxis_title=None, yaxis_title="Jumlah Kasus")
+    return fig
+
+
+def map_figure(map_cells):
+    fig = px.scatter_map(
+        map_cells, lat='lat', lon='lon', size='Jumlah', color='Status Dominan', size_max=40, zoom=3.5,
+        hover_name='Wilayah', hover_data={'Jumlah': True, 'Rincian Status': True, 'lat': False, 'lon': False},
+        map_style="carto-positron"
+    )
+    fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', height=400, margin={"r":0,"t":0,"l":0,"b":0}, dragmode="pan")
+    return fig
+
+
+def top_wilayah_figure(top):
+    top_chart = top.reset_index()
+    top_chart.columns = ['Wilayah', 'Jumlah']
+    fig = px.bar(top_chart, x='Jumlah', y='Wilayah', orientation='h', text='Jumlah', color='Jumlah', color_continuous_scale=['#a6c9e2', '#004a99'])
+    fig.update_layout(**TRANSPARENT, xaxis_title=None, yaxis_title=None, yaxis=dict(autorange="reversed"), height=350, coloraxis_showscale=False)
+    return fig
+
+
+def target_figure(target_df, target=ANNUAL_TARGET):
+    target_df = target_df.assign(Target=target, Tahun=target_df['Tahun'].astype(str))
+    fig = px.bar(target_df, x='Tahun', y=['Realisasi', 'Target'], barmode='group', color_discrete_map={'Realisasi': '#004a99', 'Target': '#e65100'})
+    fig.update_layout(**TRANSPARENT, height=350, xaxis_title=None, yaxis_title="Jumlah Kasus", legend=H_LEGEND)
+    return fig
+
+
+def sla_figure(backlog, bucket_labels):
+    aging_df = backlog[bucket_labels].reset_index().melt(id_vars=backlog.index.name or 'index', var_name='Umur', value_name='Jumlah')
+    fig = px.bar(aging_df, x='Jumlah', y=aging_df.columns[0], color='Umur', orientation='h', color_discrete_sequence=['#a6c9e2', '#004a99', '#e65100', '#dc2626'])
+    fig.update_layout(**TRANSPARENT, height=350, xaxis_title="Laporan Berjalan", yaxis_title=None, legend=H_LEGEND)
+    return fig
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from data_sources import CATEGORY_COLUMNS
+from sync import DATE_COLUMN
+
+# Kolom teks dengan nilai unik <= rasio ini (terhadap jumlah baris) disimpan sebagai kategori;
+# sisanya (nama, nomor arsip) sebagai string Arrow.
+CATEGORY_MAX_RATIO = 0.2
+# Label status baku; variasi penulisan (huruf besar/kecil, spasi ganda) dipetakan ke sini
+STATUS_LABELS = ['Proses', 'Berproses', 'Pemeriksaan', 'Selesai', 'Tutup']
+TEXT_DTYPE = pd.StringDtype("pyarrow")
+
+
+def normalize_status(series):
+    # Hasil: kategori berkode int8 dengan urutan STATUS_LABELS, label tak dikenal di belakang
+    cat = series.astype('category')
+    canonical = {label.casefold(): label for label in STATUS_LABELS}
+    targets = [canonical.get(" ".join(str(c).split()).casefold(), " ".join(str(c).split()))
+               for c in cat.cat.categories]
+    order = [l for l in STATUS_LABELS if l in targets] + sorted(set(targets) - set(STATUS_LABELS))
+    remap = np.array([order.index(t) for t in targets] + [-1])
+    codes = remap[cat.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=order), index=series.index, name=series.name)
+
+
+def _is_text(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+def compact_frame(df):
+    # Satu kali normalisasi setelah sinkronisasi: kategori untuk kolom berkardinalitas rendah,
+    # enum status, datetime64 untuk tanggal, string Arrow untuk teks bebas.
+    # Frame hasilnya dipakai bersama (read-only) oleh semua turunan; tidak perlu disalin lagi.
+    limit = max(1, int(len(df) * CATEGORY_MAX_RATIO))
+    columns = {}
+    for col in df.columns:
+        s = df[col]
+        if col == 'Status':
+            s = normalize_status(s)
+        elif col == DATE_COLUMN:
+            if not pd.api.types.is_datetime64_any_dtype(s.dtype):
+                s = pd.to_datetime(s, errors='coerce')
+        elif col == 'Tahun':
+            s = pd.to_numeric(s, errors='coerce').astype('Int16')
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.cat.remove_unused_categories()
+        elif _is_text(s):
+            if col in CATEGORY_COLUMNS or s.nunique(dropna=True) <= limit:
+                s = s.astype('category')
+            else:
+                s = s.astype(TEXT_DTYPE)
+        columns[col] = s
+    return pd.DataFrame(columns).reset_index(drop=True)
+
+
+def memory_report(before, after):
+    # Byte per baris tiap kolom sebelum/sesudah compact_frame (memory_usage deep)
+    rows = max(len(after), 1)
+    used_before = before.memory_usage(deep=True, index=False)
+    used_after = after.memory_usage(deep=True, index=False).reindex(used_before.index)
+    report = pd.DataFrame({
+        'Tipe Awal': before.dtypes.astype(str),
+        'Tipe Ringkas': after.dtypes.reindex(before.columns).astype(str),
+        'Byte/Baris Awal': used_before / rows,
+        'Byte/Baris Ringkas': used_after / rows,
+    })
+    report.loc['Total'] = ['', '', used_before.sum() / rows, used_after.sum() / rows]
+    report.index.name = 'Kolom'
+    return report.round(1)
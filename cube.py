@@ -0,0 +1,137 @@
+import pandas as pd
+
+from filters import FilterEngine
+from sync import DATE_COLUMN
+
+DONE_PATTERN = 'Selesai|Tutup'
+DIMENSIONS = ['Bulan', 'Tahun', 'Asisten', 'Lokasi LM', 'Status']
+
+
+def is_done(status):
+    # Regex hanya dijalankan sekali per label status unik, bukan per baris
+    labels = pd.Series(status.dropna().unique())
+    done = set(labels[labels.astype(str).str.contains(DONE_PATTERN, case=False, na=False)])
+    return status.isin(done).to_numpy()
+
+
+def _month_start(ts):
+    return ts.to_period('M').to_timestamp()
+
+
+def split_period(start, end):
+    # Periode [start, end] (inklusif) -> bulan utuh [first, stop) yang dijawab dari sel cube, dan
+    # potongan bulan di tepi (paling banyak dua) yang harus dihitung dari baris
+    lo = None if start is None else pd.Timestamp(start).normalize()
+    stop_day = None if end is None else pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    first = lo if lo is None or lo.day == 1 else _month_start(lo) + pd.offsets.MonthBegin(1)
+    stop = None if stop_day is None else _month_start(stop_day)
+    edges = []
+    day = pd.Timedelta(days=1)
+    if lo is not None and lo < first:
+        edges.append((lo, (first if stop_day is None else min(first, stop_day)) - day))
+    if stop is not None and stop < stop_day and (first is None or stop >= first):
+        edges.append((stop, stop_day - day))
+    return first, stop, edges
+
+
+class ComplaintCube:
+    # Jumlah laporan per (bulan, tahun, asisten, wilayah, status); kelas "Selesai" ikut disimpan.
+    # Jumlah sel dibatasi jumlah bulan x kombinasi kategori, bukan jumlah laporan. Filter periode
+    # yang tidak jatuh di batas bulan menghitung dua bulan tepinya dari baris (lewat FilterEngine).
+    def __init__(self, cells, dims, has_date=False, frame=None, engine=None):
+        self.cells = cells
+        self.dims = dims
+        self.has_date = has_date
+        self.frame = frame
+        self.engine = engine
+
+    @staticmethod
+    def _cells(df, has_date):
+        frame = pd.DataFrame(index=df.index)
+        if has_date:
+            frame['Bulan'] = df[DATE_COLUMN].dt.to_period('M').dt.to_timestamp()
+        # Tahun hanya jadi dimensi bila memang kolom data; bila turunan tanggal, dihitung dari Bulan
+        if 'Tahun' in df.columns:
+            frame['Tahun'] = df['Tahun']
+        for col in ['Asisten', 'Lokasi LM', 'Status']:
+            if col in df.columns:
+                frame[col] = df[col]
+        frame['Selesai'] = is_done(df['Status']) if 'Status' in df.columns else False
+
+        dims = [c for c in DIMENSIONS if c in frame.columns]
+        cells = (frame.groupby(dims + ['Selesai'], dropna=False, observed=True, sort=False)
+                 .size().rename('Jumlah').reset_index())
+        return cells, dims
+
+    @classmethod
+    def from_frame(cls, df, has_date, engine=None):
+        # engine: FilterEngine milik frame yang sama (dipakai bersama snapshot); dibuat sendiri bila perlu
+        cells, dims = cls._cells(df, has_date)
+        return cls(cells, dims, has_date, df, engine)
+
+    def _edge_cells(self, edges, equals):
+        if self.frame is None:
+            raise ValueError("Periode yang tidak jatuh di batas bulan hanya bisa difilter dari cube hasil from_frame")
+        if self.engine is None:
+            self.engine = FilterEngine(self.frame)
+        return [self._cells(self.frame.iloc[self.engine.select(lo, hi, **equals)], self.has_date)[0]
+                for lo, hi in edges]
+
+    def filter(self, start=None, end=None, **equals):
+        # equals: {kolom: nilai atau daftar nilai}, mis. Asisten="Dessy", Status=["Selesai", "Tutup"];
+        # nama kolom berspasi lewat dict (**{'Lokasi LM': ...})
+        equals = {k: v for k, v in equals.items() if v is not None}
+        cells = self.cells
+        if 'Bulan' in cells.columns and (start is not None or end is not None):
+            first, stop, edges = split_period(start, end)
+            in_period = pd.Series(True, index=cells.index)
+            if first is not None:
+                in_period &= cells['Bulan'] >= first
+            if stop is not None:
+                in_period &= cells['Bulan'] < stop
+            cells = cells[in_period.to_numpy()]
+            if edges:
+                cells = pd.concat([cells] + self._edge_cells(edges, equals), ignore_index=True)
+        mask = pd.Series(True, index=cells.index)
+        for col, value in equals.items():
+            if col not in cells.columns:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                mask &= cells[col].isin(value)
+            else:
+                mask &= cells[col] == value
+        return ComplaintCube(cells[mask.to_numpy()], self.dims, self.has_date)
+
+    # --- METRIK ---
+    def total(self):
+        return int(self.cells['Jumlah'].sum())
+
+    def selesai(self):
+        return int(self.cells.loc[self.cells['Selesai'], 'Jumlah'].sum())
+
+    def counts_by(self, col):
+        if col == 'Tahun' and col not in self.cells.columns and 'Bulan' in self.cells.columns:
+            return self.cells.groupby(self.cells['Bulan'].dt.year.rename('Tahun'))['Jumlah'].sum()
+        if col not in self.cells.columns:
+            return pd.Series(dtype='int64')
+        return self.cells.groupby(col, observed=True)['Jumlah'].sum()
+
+    def monthly_trend(self):
+        if 'Bulan' not in self.cells.columns:
+            return pd.DataFrame(columns=[DATE_COLUMN, 'Jumlah Laporan'])
+        dated = self.cells.dropna(subset=['Bulan'])
+        trend = dated.set_index('Bulan')['Jumlah'].resample('ME').sum()
+        return trend.rename_axis(DATE_COLUMN).reset_index(name='Jumlah Laporan')
+
+    def by_year(self, name='Jumlah Laporan'):
+        return self.counts_by('Tahun').reset_index(name=name)
+
+    def top(self, col, n=10):
+        return self.counts_by(col).nlargest(n)
+
+    def mode(self, col, default="-"):
+        counts = self.counts_by(col)
+        if counts.empty:
+            return default
+        # Sama seperti Series.mode(): bila seri, ambil label terkecil
+        return sorted(counts[counts == counts.max()].index)[0]
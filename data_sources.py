@@ -0,0 +1,137 @@
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from settings import cache_path
+from sync import DATE_COLUMN, SyncResult, detect_date_column, detect_date_format
+
+# Kolom yang dipakai dashboard beserta tipe datanya; kolom lain di workbook diabaikan
+EXCEL_DTYPES = {
+    'Tahun': 'Int64',
+    'Nomor Arsip': str,
+    'Nama Pelapor': str,
+    'Terlapor': str,
+    'Lokasi LM': 'category',
+    'Provinsi': 'category',
+    'Asisten': 'category',
+    'Status': 'category',
+    'Maladministrasi': str,
+}
+CATEGORY_COLUMNS = [c for c, t in EXCEL_DTYPES.items() if t == 'category']
+
+
+# --- SUMBER DATA ---
+# Setiap sumber cukup punya method read() yang mengembalikan DataFrame mentah.
+class GSheetsSource:
+    def __init__(self, connection_name="gsheets", ttl=0):
+        self.connection_name = connection_name
+        # ttl=0: cache hasil sudah diatur oleh load_data & snapshot lokal
+        self.ttl = ttl
+
+    def read(self):
+        import streamlit as st
+        from streamlit_gsheets import GSheetsConnection
+
+        conn = st.connection(self.connection_name, type=GSheetsConnection)
+        return conn.read(ttl=self.ttl)
+
+
+class FakeSheetSource:
+    # Pengganti Google Sheet untuk pengujian/dev offline
+    def __init__(self, df):
+        self.df = df.copy()
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        return self.df.copy()
+
+    def append(self, rows):
+        self.df = pd.concat([self.df, pd.DataFrame(rows)], ignore_index=True)
+
+    def update(self, row, column, value):
+        self.df.loc[self.df.index[row], column] = value
+
+    def delete(self, row):
+        self.df = self.df.drop(index=self.df.index[row]).reset_index(drop=True)
+
+
+class ExcelDirectorySource:
+    # Membaca semua workbook (*.xlsx) di satu folder; hasil parsing tiap file
+    # disimpan sebagai Parquet dengan kunci mtime+ukuran file.
+    def __init__(self, directory, pattern="*.xlsx"):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.cache_dir = cache_path("excel")
+        self.cache_dir.mkdir(exist_ok=True)
+
+    def files(self):
+        # Diurutkan dari yang terlama, supaya saat de-duplikasi file terbaru yang menang
+        files = [f for f in self.directory.glob(self.pattern) if not f.name.startswith("~$")]
+        return sorted(files, key=lambda f: (f.stat().st_mtime_ns, f.name))
+
+    def _read_workbook(self, path):
+        date_col = None
+
+        def wanted(col):
+            nonlocal date_col
+            if col in EXCEL_DTYPES:
+                return True
+            if date_col is None and detect_date_column([col]):
+                date_col = col
+                return True
+            return False
+
+        df = pd.read_excel(path, usecols=wanted, dtype=EXCEL_DTYPES)
+        df = df.dropna(how="all")
+        if date_col is not None:
+            df[date_col] = pd.to_datetime(df[date_col], format=detect_date_format(df[date_col]), errors='coerce')
+            df = df.rename(columns={date_col: DATE_COLUMN})
+        return df
+
+    def _load_file(self, path):
+        stat = path.stat()
+        cached = self.cache_dir / f"{path.stem}-{stat.st_mtime_ns}-{stat.st_size}.parquet"
+        if cached.exists():
+            return pd.read_parquet(cached), True
+        df = self._read_workbook(path)
+        for old in self.cache_dir.glob(f"{path.stem}-*.parquet"):
+            old.unlink(missing_ok=True)
+        tmp = cached.with_suffix(".tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, cached)
+        return df, False
+
+    def sync(self):
+        files = self.files()
+        if not files:
+            raise FileNotFoundError(f"Tidak ada file {self.pattern} di {self.directory}")
+        frames, reused = [], 0
+        for path in files:
+            df, from_cache = self._load_file(path)
+            frames.append(df)
+            reused += from_cache
+        data = pd.concat(frames, ignore_index=True)
+        file_no = np.repeat(np.arange(len(frames)), [len(f) for f in frames])
+
+        # File sama bisa diekspor ulang: laporan (Nomor Arsip, atau isi baris bila tanpa nomor) yang
+        # muncul di beberapa file diambil dari file terbaru saja. Baris kembar di dalam satu file
+        # dibiarkan, karena Nomor Arsip tidak dijamin unik.
+        key = pd.Series(pd.util.hash_pandas_object(data, index=False).to_numpy(), index=data.index)
+        if 'Nomor Arsip' in data.columns:
+            has_no = data['Nomor Arsip'].notna()
+            key[has_no] = pd.util.hash_pandas_object(data.loc[has_no, 'Nomor Arsip'].astype(str), index=False).to_numpy()
+        newest = pd.Series(file_no, index=data.index).groupby(key.to_numpy()).transform('max').to_numpy()
+        data = data[file_no == newest].reset_index(drop=True)
+        for col in CATEGORY_COLUMNS:
+            if col in data.columns:
+                data[col] = data[col].astype('category')
+
+        signature = "|".join(f"{f.name}:{f.stat().st_mtime_ns}:{f.stat().st_size}" for f in files)
+        version = hashlib.sha1(signature.encode()).hexdigest()[:16]
+        has_date = DATE_COLUMN in data.columns and data[DATE_COLUMN].notna().any()
+        return SyncResult(data, bool(has_date), version,
+                          {'files': len(files), 'parsed': len(files) - reused, 'reused': reused})
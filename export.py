@@ -0,0 +1,114 @@
+import hashlib
+import os
+import tempfile
+
+import pandas as pd
+
+from settings import cache_path
+
+# format: (label, mime, ekstensi)
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'text/csv', 'csv'),
+    'xlsx': ('Excel (XLSX)', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'parquet': ('Parquet', 'application/vnd.apache.parquet', 'parquet'),
+}
+CHUNK_ROWS = 50_000
+MAX_CACHED_EXPORTS = 20
+
+
+def filter_signature(*parts):
+    # Kunci artefak: versi data + kombinasi filter aktif
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def write_atomic(path, write):
+    # Setiap penulis punya file sementara sendiri; beberapa sesi yang membangun artefak yang sama
+    # bersamaan tidak saling menimpa, yang terakhir selesai cukup mengganti file akhir.
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix='.tmp', delete=False) as f:
+        tmp = f.name
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.unlink(tmp)
+            raise
+    os.replace(tmp, path)
+    return path
+
+
+def _chunks(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def iter_csv(df, chunk_rows=CHUNK_ROWS):
+    # Generator bytes CSV per potongan baris; tidak pernah membuat satu string CSV utuh
+    for i, chunk in enumerate(_chunks(df, chunk_rows)):
+        yield chunk.to_csv(index=False, header=(i == 0)).encode('utf-8')
+    if df.empty:
+        yield df.to_csv(index=False).encode('utf-8')
+
+
+def _write_csv(df, f):
+    for part in iter_csv(df):
+        f.write(part)
+
+
+def _cell(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value
+
+
+def _write_xlsx(df, f):
+    from openpyxl import Workbook
+
+    # Mode write_only: baris langsung ditulis ke file, tidak disimpan di memori openpyxl
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Laporan")
+    ws.append([str(c) for c in df.columns])
+    for chunk in _chunks(df):
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append([_cell(v) for v in row])
+    wb.save(f)
+
+
+def _write_parquet(df, f):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(f, schema) as writer:
+        for chunk in _chunks(df):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+WRITERS = {'csv': _write_csv, 'xlsx': _write_xlsx, 'parquet': _write_parquet}
+
+
+def export_path(signature, fmt):
+    return cache_path("exports") / f"{signature}.{EXPORT_FORMATS[fmt][2]}"
+
+
+def cached_export(signature, fmt):
+    path = export_path(signature, fmt)
+    return path if path.exists() else None
+
+
+def build_export(rows, fmt, signature):
+    # rows: fungsi yang mengembalikan DataFrame; hanya dipanggil bila artefak belum ada
+    path = export_path(signature, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        return path
+    write_atomic(path, lambda f: WRITERS[fmt](rows(), f))
+    _prune(path.parent)
+    return path
+
+
+def _prune(folder):
+    files = sorted((p for p in folder.iterdir() if p.suffix != '.tmp'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in files[MAX_CACHED_EXPORTS:]:
+        old.unlink(missing_ok=True)
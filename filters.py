@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from sync import DATE_COLUMN
+
+FILTER_COLUMNS = ['Asisten', 'Lokasi LM', 'Status']
+MEMO_SIZE = 128
+
+
+class ValueIndex:
+    # Posisi baris per nilai unik kolom (format CSR, posisi terurut naik)
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series)
+        self.labels = list(uniques)
+        self.codes = codes
+        self.lookup = {label: i for i, label in enumerate(self.labels)}
+        valid = codes >= 0
+        self.rows = np.flatnonzero(valid)[np.argsort(codes[valid], kind='stable')]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(codes[valid], minlength=len(self.labels)))])
+
+    def positions(self, values):
+        parts = [self.rows[self.offsets[i]:self.offsets[i + 1]]
+                 for i in (self.lookup.get(v) for v in values) if i is not None]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def options(self, positions):
+        present = np.unique(self.codes[positions])
+        return sorted(self.labels[i] for i in present if i >= 0)
+
+
+class DateIndex:
+    def __init__(self, series):
+        values = series.to_numpy(dtype='datetime64[ns]')
+        valid = np.flatnonzero(~np.isnat(values))
+        order = np.argsort(values[valid], kind='stable')
+        self.rows = valid[order]
+        self.sorted_dates = values[valid][order]
+
+    def positions(self, start=None, end=None):
+        lo = 0 if start is None else np.searchsorted(self.sorted_dates, np.datetime64(pd.Timestamp(start)), 'left')
+        # end inklusif sampai akhir hari
+        hi = len(self.sorted_dates) if end is None else np.searchsorted(
+            self.sorted_dates, np.datetime64(pd.Timestamp(end) + pd.Timedelta(days=1)), 'left')
+        return np.sort(self.rows[lo:hi])
+
+
+class FilterEngine:
+    # Indeks dibangun sekali per versi data; kombinasi filter dijawab dengan irisan array posisi
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.values = {c: ValueIndex(df[c]) for c in columns if c in df.columns}
+        self.dates = DateIndex(df[DATE_COLUMN]) if DATE_COLUMN in df.columns else None
+        # Memo dipakai bersama semua sesi (engine milik snapshot): diakses di bawah lock
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _as_tuple(value):
+        return tuple(value) if isinstance(value, (list, tuple, set)) else (value,)
+
+    def select(self, start=None, end=None, query=None, search=None, **equals):
+        # search: fungsi query -> posisi baris (mis. SearchIndex.search), hanya dipanggil saat cache miss
+        equals = {k: self._as_tuple(v) for k, v in equals.items() if v is not None and k in self.values}
+        key = (start, end, query or None, tuple(sorted(equals.items())))
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        parts = []
+        if self.dates is not None and (start is not None or end is not None):
+            parts.append(self.dates.positions(start, end))
+        if query and search is not None:
+            ids = search(query)
+            if ids is not None:
+                parts.append(np.asarray(ids, dtype=np.int64))
+        for col, values in equals.items():
+            parts.append(self.values[col].positions(values))
+
+        if not parts:
+            result = np.arange(self.n_rows)
+        else:
+            parts.sort(key=len)
+            result = parts[0]
+            for other in parts[1:]:
+                if not len(result):
+                    break
+                result = np.intersect1d(result, other, assume_unique=True)
+        result.setflags(write=False)
+
+        with self._lock:
+            # Dua sesi bisa menghitung kombinasi yang sama bersamaan; yang pertama disimpan
+            result = self._memo.setdefault(key, result)
+            self._memo.move_to_end(key)
+            if len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return result
+
+    def options(self, column, positions):
+        return self.values[column].options(positions) if column in self.values else []
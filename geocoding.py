@@ -0,0 +1,210 @@
+import csv
+import re
+import sqlite3
+from datetime import datetime
+
+from settings import DATA_DIR, cache_path
+
+# Lokasi yang sama sekali tidak dikenali diberi koordinat kosong (NaN), bukan dititipkan ke
+# Jakarta, supaya tidak menumpuk di satu titik peta
+UNRESOLVED = (None, None)
+
+# Singkatan yang sering muncul di kolom Lokasi LM / Terlapor
+ALIASES = {
+    "kab": "kabupaten",
+    "kot": "kota",
+    "jakarta raya": "dki jakarta",
+    "diy": "di yogyakarta",
+    "jogja": "yogyakarta",
+    "sumut": "sumatera utara", "sumbar": "sumatera barat", "sumsel": "sumatera selatan",
+    "jabar": "jawa barat", "jateng": "jawa tengah", "jatim": "jawa timur",
+    "kalbar": "kalimantan barat", "kalteng": "kalimantan tengah", "kalsel": "kalimantan selatan",
+    "kaltim": "kalimantan timur", "kaltara": "kalimantan utara",
+    "sulut": "sulawesi utara", "sulteng": "sulawesi tengah", "sulsel": "sulawesi selatan",
+    "sultra": "sulawesi tenggara", "sulbar": "sulawesi barat",
+    "ntb": "nusa tenggara barat", "ntt": "nusa tenggara timur",
+    "babel": "kepulauan bangka belitung", "kepri": "kepulauan riau",
+}
+ADMIN_PREFIXES = ("kabupaten ", "kota ", "provinsi ", "prov ", "kantah ")
+
+
+class GeocoderOffline(Exception):
+    """Backend geocoding tidak bisa dihubungi (jaringan mati / layanan down)."""
+
+
+def normalize_location(name):
+    # Kunci cache: huruf kecil, tanpa tanda baca, singkatan diseragamkan
+    text = re.sub(r"[^\w,]+", " ", str(name).lower())
+    parts = []
+    for part in text.split(","):
+        part = " ".join(part.split())
+        part = ALIASES.get(part, part)
+        first, _, rest = part.partition(" ")
+        if first in ALIASES and rest:
+            part = f"{ALIASES[first]} {rest}"
+        if part:
+            parts.append(part)
+    return ", ".join(parts)
+
+
+# --- BACKEND GEOCODING ---
+class NominatimBackend:
+    def __init__(self, user_agent="ombudsman_dash_v6_light", min_delay_seconds=1):
+        self.user_agent = user_agent
+        self.min_delay_seconds = min_delay_seconds
+        self._geocode = None
+
+    def geocode(self, query):
+        from geopy.exc import GeocoderServiceError
+
+        if self._geocode is None:
+            from geopy.geocoders import Nominatim
+            from geopy.extra.rate_limiter import RateLimiter
+            geolocator = Nominatim(user_agent=self.user_agent)
+            # swallow_exceptions=False agar error jaringan bisa dideteksi sebagai offline
+            self._geocode = RateLimiter(geolocator.geocode, min_delay_seconds=self.min_delay_seconds,
+                                        max_retries=0, swallow_exceptions=False)
+        try:
+            location = self._geocode(f"{query}, Indonesia")
+        except (GeocoderServiceError, OSError) as e:
+            raise GeocoderOffline(str(e)) from e
+        return (location.latitude, location.longitude) if location else None
+
+
+class StaticBackend:
+    # Backend lokal untuk pengujian/dev tanpa internet: {lokasi: (lat, lon)}
+    def __init__(self, mapping=None, offline=False):
+        self.mapping = {normalize_location(k): v for k, v in (mapping or {}).items()}
+        self.offline = offline
+        self.calls = []
+
+    def geocode(self, query):
+        self.calls.append(query)
+        if self.offline:
+            raise GeocoderOffline("StaticBackend offline")
+        return self.mapping.get(normalize_location(query))
+
+
+class Gazetteer:
+    # Tabel centroid provinsi/kabupaten/kota bawaan (data/gazetteer_id.csv)
+    def __init__(self, path=DATA_DIR / "gazetteer_id.csv"):
+        self.table = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                self.table[row["nama"]] = (float(row["lat"]), float(row["lon"]))
+        # Nama terpanjang dulu supaya "jakarta selatan" menang atas "jakarta"
+        self._names = sorted(self.table, key=len, reverse=True)
+
+    def _lookup_part(self, part):
+        if part in self.table:
+            return self.table[part]
+        for prefix in ADMIN_PREFIXES:
+            if part.startswith(prefix) and part[len(prefix):] in self.table:
+                return self.table[part[len(prefix):]]
+        return None
+
+    def lookup(self, key):
+        # key sudah dinormalisasi; bagian paling spesifik (sebelum koma) dicoba dulu
+        for part in [key] + key.split(", "):
+            coord = self._lookup_part(part)
+            if coord:
+                return coord
+        for name in self._names:
+            if re.search(rf"\b{re.escape(name)}\b", key):
+                return self.table[name]
+        return None
+
+
+# --- CACHE PERSISTEN (SQLITE) ---
+class GeocodeCache:
+    def __init__(self, path=None):
+        self.path = str(path or cache_path("geocode.sqlite"))
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "key TEXT PRIMARY KEY, lat REAL, lon REAL, source TEXT, updated_at TEXT)"
+            )
+
+    def _connect(self):
+        # Koneksi pendek per operasi: aman dipakai dari beberapa thread Streamlit
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = {}
+        with self._connect() as conn:
+            # Batasi jumlah parameter per query (limit SQLite)
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, lat, lon FROM geocode WHERE key IN ({placeholders})", chunk
+                )
+                found.update({k: (lat, lon) if lat is not None else UNRESOLVED for k, lat, lon in rows})
+        return found
+
+    def put_many(self, entries):
+        # entries: iterable (key, (lat, lon), source)
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [(k, c[0], c[1], src, now) for k, c, src in entries]
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?)", rows)
+
+
+class Geocoder:
+    def __init__(self, cache=None, backend=None, gazetteer=None, flush_every=25):
+        self.cache = cache or GeocodeCache()
+        self.backend = backend if backend is not None else NominatimBackend()
+        self.gazetteer = gazetteer or Gazetteer()
+        self.flush_every = flush_every
+
+    def resolve(self, locations, progress=None):
+        # Kembalikan {lokasi asli: (lat, lon)}, (None, None) bila tidak dikenali;
+        # hanya kunci baru yang ditanyakan ke backend
+        keys_by_loc = {loc: normalize_location(loc) for loc in locations}
+        originals = {}
+        for loc, key in keys_by_loc.items():
+            originals.setdefault(key, loc)
+        coords = self.cache.get_many(originals)
+        missing = [k for k in originals if k not in coords]
+
+        pending = []
+        offline = False
+        for i, key in enumerate(missing):
+            coord, source = None, None
+            if not offline:
+                try:
+                    coord = self.backend.geocode(originals[key])
+                    source = "backend" if coord else None
+                except GeocoderOffline:
+                    # Jangan coba jaringan lagi di batch ini; hasil gazetteer tidak disimpan
+                    # agar kunci ini dicoba ulang saat online.
+                    offline = True
+            if coord is None:
+                coord = self.gazetteer.lookup(key)
+                if coord is None:
+                    coord, source = UNRESOLVED, "unresolved"
+            coords[key] = coord
+            if not offline:
+                pending.append((key, coord, source or "gazetteer"))
+            if len(pending) >= self.flush_every:
+                self.cache.put_many(pending)
+                pending = []
+            if progress:
+                progress(i + 1, len(missing))
+        self.cache.put_many(pending)
+
+        return {loc: coords[key] for loc, key in keys_by_loc.items()}
+
+
+def add_coordinates(df, geocoder, loc_col=None, progress=None):
+    loc_col = loc_col or ('Lokasi LM' if 'Lokasi LM' in df.columns else 'Terlapor')
+    if loc_col not in df.columns:
+        return df
+    unique_locations = df[loc_col].dropna().unique()
+    location_map = geocoder.resolve(unique_locations, progress=progress)
+    df['lat'] = df[loc_col].map(lambda x: location_map.get(x, UNRESOLVED)[0]).astype(float)
+    df['lon'] = df[loc_col].map(lambda x: location_map.get(x, UNRESOLVED)[1]).astype(float)
+    return df
@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# Permintaan yang tidak diperbarui selama ini (mis. tab admin ditutup) dianggap sudah berakhir
+MEMORY_REQUEST_TTL = 600
+
+# True bila tracemalloc dinyalakan oleh Profiler (bukan oleh pemanggil lain), agar bisa dimatikan lagi
+_tracing_started = False
+# Pemilik (sesi) yang sedang meminta pengukuran memori -> waktu permintaan terakhir
+_memory_owners = {}
+_memory_lock = threading.Lock()
+
+
+def _update_tracing(owner, track_memory, now=None):
+    # tracemalloc berlaku untuk seluruh proses: hanya dimatikan bila tidak ada sesi yang masih memintanya
+    global _tracing_started
+    now = time.monotonic() if now is None else now
+    with _memory_lock:
+        if track_memory:
+            _memory_owners[owner] = now
+        else:
+            _memory_owners.pop(owner, None)
+        for other, seen in list(_memory_owners.items()):
+            if now - seen > MEMORY_REQUEST_TTL:
+                del _memory_owners[other]
+        if _memory_owners and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        elif not _memory_owners and _tracing_started:
+            # Pelacakan alokasi membebani semua sesi; matikan begitu tidak diminta lagi
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+class Profiler:
+    # Pencatat waktu (dan opsional memori) per tahap rerun dashboard / benchmark.
+    # Memori diukur dengan tracemalloc: berlaku untuk seluruh proses, jadi angka bisa ikut
+    # terpengaruh sesi lain yang berjalan bersamaan. Tahap sebaiknya tidak bersarang bila memori diukur.
+    # Tahap bersarang dicatat dengan depth > 0 dan tidak ikut dijumlah di total().
+    # owner: pengenal sesi yang meminta pengukuran memori; sesi lain tanpa permintaan tidak mematikannya.
+    def __init__(self, track_memory=False, label="", owner=None):
+        self.label = label
+        self.track_memory = track_memory
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.records = []
+        self._depth = 0
+        _update_tracing(owner, track_memory)
+
+    @contextmanager
+    def stage(self, name, **info):
+        record = {'stage': name, 'depth': self._depth, **info}
+        self._depth += 1
+        # Sesi lain bisa mematikan tracemalloc di tengah rerun ini
+        measure = self.track_memory and tracemalloc.is_tracing()
+        if measure:
+            tracemalloc.reset_peak()
+            mem_start = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._depth -= 1
+            if measure and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                record['mem_delta_kb'] = (current - mem_start) / 1024
+                record['mem_peak_kb'] = (peak - mem_start) / 1024
+            self.records.append(record)
+
+    def total(self):
+        return sum(r['seconds'] for r in self.records if r['depth'] == 0)
+
+    def to_frame(self):
+        df = pd.DataFrame(self.records)
+        if not df.empty:
+            df['ms'] = (df.pop('seconds') * 1000).round(2)
+        return df
+
+    def to_dict(self):
+        return {'label': self.label, 'started_at': self.started_at,
+                'total_seconds': self.total(), 'stages': self.records}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), default=str, **kwargs)
+
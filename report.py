@@ -0,0 +1,337 @@
+# Laporan statis (PDF/HTML) dari snapshot data, tanpa browser dan tanpa Streamlit.
+# Jalankan:
+#   python report.py                                  -> laporan seluruh data (PDF)
+#   python report.py --asisten Sigit --wilayah Bogor --format html
+#   python report.py --mulai 2024-01-01 --sampai 2024-06-30 --status Proses --cari kantah
+#   python report.py --all --workers 4                -> semua kombinasi Asisten/Wilayah, paralel
+#   python report.py --all --every 60                 -> ulangi tiap 60 menit (terjadwal)
+#   python report.py --excel                          -> bangun snapshot dari workbook lokal dulu
+import argparse
+import base64
+import html
+import io
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from charts import ANNUAL_TARGET
+from cube import ComplaintCube
+from data_sources import ExcelDirectorySource
+from export import filter_signature, write_atomic
+from geocoding import Geocoder, StaticBackend
+from settings import EXCEL_DIR, cache_path
+from sla import build_sla_report
+from store import SnapshotStore, build_snapshot
+
+# format: (label, mime, ekstensi)
+REPORT_FORMATS = {
+    'pdf': ('PDF', 'application/pdf', 'pdf'),
+    'html': ('HTML', 'text/html', 'html'),
+}
+KEEP_VERSIONS = 2
+BLUE, ORANGE = '#004a99', '#e65100'
+SLA_COLORS = ['#a6c9e2', '#004a99', '#e65100', '#dc2626']
+
+
+def report_filters(asisten=None, wilayah=None, start=None, end=None, status=None, query=None):
+    # Filter laporan = filter sidebar dashboard; nilai kosong dibuang agar kunci cache stabil
+    filters = dict(asisten=asisten, wilayah=wilayah, start=start, end=end,
+                   status=tuple(sorted(status)) if status else None, query=query or None)
+    return {k: v for k, v in filters.items() if v is not None}
+
+
+def report_path(version, today, fmt='pdf', **filters):
+    # Satu folder per versi data; nama file = tanggal (umur SLA) + kombinasi filter
+    name = filter_signature(today.isoformat(), sorted(report_filters(**filters).items()))
+    return cache_path("reports") / version / f"{name}.{REPORT_FORMATS[fmt][2]}"
+
+
+def cached_report(version, today, fmt='pdf', **filters):
+    path = report_path(version, today, fmt, **filters)
+    return path if path.exists() else None
+
+
+def report_data(snapshot, today, asisten=None, wilayah=None, start=None, end=None, status=None, query=None):
+    # Agregasi yang sama dengan dashboard: cube untuk KPI & grafik, SlaReport untuk backlog
+    equals = {k: v for k, v in {'Asisten': asisten, 'Lokasi LM': wilayah, 'Status': status}.items() if v}
+    if query:
+        # Sama seperti dashboard: pencarian teks tidak bisa dipetakan ke sel cube
+        positions = snapshot.filter_engine.select(start, end, query=query, search=snapshot.search_index.search, **equals)
+        cube = ComplaintCube.from_frame(snapshot.data.iloc[positions], snapshot.has_date)
+    else:
+        positions = snapshot.filter_engine.select(start, end, **equals)
+        cube = snapshot.cube.filter(start, end, **equals)
+    if equals or query or start or end:
+        sla = build_sla_report(snapshot.data.iloc[positions], today)
+    else:
+        sla = snapshot.sla_report(today)
+    total, selesai = cube.total(), cube.selesai()
+    if start and end:
+        period = f"{start:%d/%m/%Y} - {end:%d/%m/%Y}"
+    elif start or end:
+        period = f"sejak {start:%d/%m/%Y}" if start else f"sampai {end:%d/%m/%Y}"
+    else:
+        period = "Seluruh periode"
+    return {
+        'asisten': asisten or "Semua Asisten",
+        'wilayah': wilayah or "Semua Wilayah",
+        'period': period,
+        'status': ", ".join(map(str, status)) if status else "Semua Status",
+        'query': query,
+        'version': snapshot.version,
+        'today': today,
+        'total': total,
+        'selesai': selesai,
+        'proses': total - selesai,
+        'rate': selesai / total * 100 if total else 0,
+        'overdue': sla.overdue,
+        'trend': cube.monthly_trend() if snapshot.has_date else cube.by_year(),
+        'trend_x': 'Tanggal Laporan' if snapshot.has_date else 'Tahun',
+        'top': cube.top('Lokasi LM', 10),
+        'target': cube.by_year('Realisasi'),
+        'backlog': sla.backlog if sla.open_cases else None,
+        'bucket_labels': sla.bucket_labels,
+    }
+
+
+# --- GRAFIK (matplotlib, API objek: aman dipakai dari thread Streamlit) ---
+def _empty(ax, text="Tidak ada data"):
+    ax.text(0.5, 0.5, text, ha='center', va='center', color='#6b7280', transform=ax.transAxes)
+    ax.set_axis_off()
+
+
+def _draw_trend(ax, data):
+    trend = data['trend']
+    ax.set_title("Tren Laporan Masuk", loc='left', fontsize=10, color=BLUE)
+    if trend.empty:
+        return _empty(ax)
+    x = trend[data['trend_x']]
+    if data['trend_x'] == 'Tahun':
+        x = x.astype(str)
+    ax.plot(x, trend['Jumlah Laporan'], color=BLUE, linewidth=2, marker='o', markerfacecolor=ORANGE, markeredgecolor=ORANGE)
+    ax.set_ylabel("Jumlah Kasus", fontsize=8)
+
+
+def _draw_top(ax, data):
+    top = data['top']
+    ax.set_title("Wilayah Laporan Terbanyak", loc='left', fontsize=10, color=BLUE)
+    if top.empty:
+        return _empty(ax)
+    labels = [str(v) for v in top.index][::-1]
+    ax.barh(labels, top.to_numpy()[::-1], color=BLUE)
+    for i, v in enumerate(top.to_numpy()[::-1]):
+        ax.text(v, i, f" {v}", va='center', fontsize=7)
+
+
+def _draw_target(ax, data):
+    target = data['target']
+    ax.set_title("Pencapaian Target", loc='left', fontsize=10, color=BLUE)
+    if target.empty:
+        return _empty(ax)
+    years = target['Tahun'].astype(str).tolist()
+    pos = range(len(years))
+    ax.bar([p - 0.2 for p in pos], target['Realisasi'], width=0.4, color=BLUE, label='Realisasi')
+    ax.bar([p + 0.2 for p in pos], [ANNUAL_TARGET] * len(years), width=0.4, color=ORANGE, label='Target')
+    ax.set_xticks(list(pos), years)
+    ax.legend(fontsize=7, frameon=False)
+
+
+def _draw_sla(ax, data):
+    backlog = data['backlog']
+    ax.set_title("Umur Backlog Laporan (SLA)", loc='left', fontsize=10, color=BLUE)
+    if backlog is None:
+        return _empty(ax, "Tidak ada laporan berjalan")
+    groups = [str(g) for g in backlog.index]
+    left = [0] * len(groups)
+    for label, color in zip(data['bucket_labels'], SLA_COLORS):
+        values = backlog[label].tolist()
+        ax.barh(groups, values, left=left, color=color, label=label)
+        left = [a + b for a, b in zip(left, values)]
+    ax.invert_yaxis()
+    ax.set_xlabel("Laporan Berjalan", fontsize=8)
+    ax.legend(fontsize=7, frameon=False, ncol=len(data['bucket_labels']), loc='lower right', bbox_to_anchor=(1, 1))
+
+
+CHARTS = [('tren', _draw_trend), ('wilayah', _draw_top), ('target', _draw_target), ('sla', _draw_sla)]
+
+
+def _style(ax):
+    ax.tick_params(labelsize=7)
+    for side in ('top', 'right'):
+        ax.spines[side].set_visible(False)
+
+
+def _kpi_lines(data):
+    return [
+        ("Total Laporan", f"{data['total']}"),
+        ("Selesai", f"{data['selesai']} ({data['rate']:.1f}%)"),
+        ("Dalam Proses", f"{data['proses']}"),
+        ("Lewat SLA", f"{data['overdue']}"),
+        ("Target Tahunan", f"{ANNUAL_TARGET}"),
+    ]
+
+
+def _subtitle(data):
+    query = f"Kata kunci: '{data['query']}'  |  " if data['query'] else ""
+    return (f"Periode: {data['period']}  |  Asisten: {data['asisten']}  |  Wilayah: {data['wilayah']}\n"
+            f"Status: {data['status']}  |  {query}Data versi {data['version']}  |  Dicetak {data['today'].strftime('%d/%m/%Y')}")
+
+
+def write_pdf(data, f):
+    # Satu halaman A4: judul, KPI, lalu empat grafik dashboard
+    page = Figure(figsize=(8.27, 11.69))
+    page.text(0.06, 0.965, "Laporan Monitoring Keasistenan Utama IV", fontsize=15, fontweight='bold', color='#003366')
+    page.text(0.06, 0.953, _subtitle(data), fontsize=8, color='#374151', va='top', linespacing=1.4)
+    for i, (label, value) in enumerate(_kpi_lines(data)):
+        x = 0.06 + i * 0.185
+        page.text(x, 0.915, label, fontsize=8, color='#6b7280')
+        page.text(x, 0.895, value, fontsize=13, fontweight='bold', color='#003366')
+    grid = page.add_gridspec(3, 2, left=0.2, right=0.95, top=0.86, bottom=0.05, hspace=0.45, wspace=0.45)
+    axes = [page.add_subplot(grid[0, :]), page.add_subplot(grid[1, 0]), page.add_subplot(grid[1, 1]), page.add_subplot(grid[2, :])]
+    for ax, (_, draw) in zip(axes, CHARTS):
+        _style(ax)
+        draw(ax, data)
+    with PdfPages(f) as pdf:
+        pdf.savefig(page)
+
+
+def write_html(data, f):
+    parts = [
+        "<!DOCTYPE html><html lang='id'><head><meta charset='utf-8'><title>Laporan Keasistenan IV</title>",
+        "<style>body{font-family:Inter,sans-serif;color:#1f2937;max-width:960px;margin:auto}"
+        "h1{color:#003366}.kpi{display:flex;gap:24px}.kpi div{border:1px solid #e5e7eb;border-radius:8px;padding:10px}"
+        "table{border-collapse:collapse}td,th{border:1px solid #e5e7eb;padding:4px 8px}</style></head><body>",
+        "<h1>Laporan Monitoring Keasistenan Utama IV</h1>",
+        f"<p>{html.escape(_subtitle(data))}</p><div class='kpi'>",
+        *(f"<div><small>{label}</small><br><b>{value}</b></div>" for label, value in _kpi_lines(data)),
+        "</div>",
+    ]
+    for name, draw in CHARTS:
+        fig = Figure(figsize=(9, 3.5))
+        ax = fig.add_subplot()
+        _style(ax)
+        draw(ax, data)
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=110)
+        parts.append(f"<p><img alt='{name}' src='data:image/png;base64,{base64.b64encode(buf.getvalue()).decode()}'></p>")
+    if data['backlog'] is not None:
+        parts.append(data['backlog'].to_html())
+    parts.append("</body></html>")
+    f.write("".join(parts).encode('utf-8'))
+
+
+WRITERS = {'pdf': write_pdf, 'html': write_html}
+
+
+def build_report(snapshot, today=None, fmt='pdf', **filters):
+    # Hanya dibangun bila belum ada untuk versi data + tanggal + kombinasi filter ini
+    today = today or date.today()
+    filters = report_filters(**filters)
+    path = report_path(snapshot.version, today, fmt, **filters)
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, lambda f: WRITERS[fmt](report_data(snapshot, today, **filters), f))
+    _prune(keep_version=snapshot.version)
+    return path
+
+
+def _prune(keep_version):
+    folders = sorted((p for p in cache_path("reports").iterdir() if p.is_dir()), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in folders[KEEP_VERSIONS:]:
+        if old.name != keep_version:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def report_combinations(snapshot):
+    # Seluruh data, per Asisten, per Wilayah, dan pasangan Asisten x Wilayah yang memang punya laporan
+    cells = snapshot.cube.cells
+    combos = [(None, None)]
+    has_asisten, has_wilayah = 'Asisten' in cells.columns, 'Lokasi LM' in cells.columns
+    if has_asisten:
+        combos += [(a, None) for a in sorted(cells['Asisten'].dropna().unique())]
+    if has_wilayah:
+        combos += [(None, w) for w in sorted(cells['Lokasi LM'].dropna().unique())]
+    if has_asisten and has_wilayah:
+        pairs = cells[['Asisten', 'Lokasi LM']].dropna().drop_duplicates().astype(object)
+        combos += sorted(pairs.itertuples(index=False, name=None))
+    return combos
+
+
+# --- PROSES PARALEL ---
+# Tiap proses pekerja memuat snapshot sendiri dari file Arrow (memory-map, dibagi lewat page cache)
+_worker_snapshot = None
+
+
+def _init_worker(directory):
+    global _worker_snapshot
+    _worker_snapshot = SnapshotStore(directory).current()
+
+
+def _run_job(job):
+    today, filters, fmt = job
+    return str(build_report(_worker_snapshot, today, fmt, **filters))
+
+
+def generate_all(store, today=None, fmt='pdf', workers=None):
+    snapshot = store.current()
+    today = today or date.today()
+    combos = [report_filters(asisten=a, wilayah=w) for a, w in report_combinations(snapshot)]
+    jobs = [(today, filters, fmt) for filters in combos if cached_report(snapshot.version, today, fmt, **filters) is None]
+    if not jobs:
+        return []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store.directory,)) as pool:
+        return list(pool.map(_run_job, jobs, chunksize=max(1, len(jobs) // (4 * (workers or 4)))))
+
+
+def _excel_snapshot(store):
+    # Backend offline: koordinat dari cache/gazetteer saja, peta tidak dipakai di laporan
+    sources = [("Workbook Lokal", ExcelDirectorySource(EXCEL_DIR))]
+    store.publish(build_snapshot(sources, Geocoder(backend=StaticBackend(offline=True)), store.current()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buat laporan PDF/HTML dari snapshot data dashboard")
+    parser.add_argument('--format', choices=list(REPORT_FORMATS), default='pdf')
+    parser.add_argument('--asisten')
+    parser.add_argument('--wilayah')
+    parser.add_argument('--mulai', type=date.fromisoformat, help="awal periode (YYYY-MM-DD)")
+    parser.add_argument('--sampai', type=date.fromisoformat, help="akhir periode (YYYY-MM-DD)")
+    parser.add_argument('--status', action='append', help="boleh diulang untuk beberapa status")
+    parser.add_argument('--cari', help="kata kunci pencarian, sintaks sama dengan kotak Cari Data")
+    parser.add_argument('--all', action='store_true', help="semua kombinasi Asisten/Wilayah (paralel)")
+    parser.add_argument('--workers', type=int, help="jumlah proses untuk --all (bawaan: jumlah CPU)")
+    parser.add_argument('--excel', action='store_true', help="bangun snapshot dari workbook lokal sebelum membuat laporan")
+    parser.add_argument('--every', type=float, help="ulangi tiap N menit")
+    args = parser.parse_args()
+
+    store = SnapshotStore()
+    while True:
+        if args.excel:
+            _excel_snapshot(store)
+        # Snapshot terbaru yang diterbitkan worker dashboard (atau --excel)
+        store = SnapshotStore(store.directory)
+        snapshot = store.current()
+        if snapshot is None:
+            raise SystemExit("Belum ada snapshot data. Jalankan dashboard terlebih dahulu atau gunakan --excel.")
+        start = time.perf_counter()
+        if args.all:
+            paths = generate_all(store, fmt=args.format, workers=args.workers)
+            print(f"[{datetime.now():%H:%M:%S}] versi {snapshot.version}: {len(paths)} laporan baru "
+                  f"dalam {time.perf_counter() - start:.1f}s ({len(report_combinations(snapshot))} kombinasi)")
+        else:
+            path = build_report(snapshot, fmt=args.format, asisten=args.asisten, wilayah=args.wilayah,
+                                start=args.mulai, end=args.sampai, status=args.status, query=args.cari)
+            print(f"[{datetime.now():%H:%M:%S}] {path}")
+        if not args.every:
+            break
+        time.sleep(args.every * 60)
+
+
+if __name__ == '__main__':
+    main()
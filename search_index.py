@@ -0,0 +1,151 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Kueri lebih pendek dari N-gram dicocokkan langsung ke nilai unik kolom
+NGRAM = 3
+SCOPED_TERM = re.compile(r'(\w+):("[^"]*"|\S+)')
+
+
+def _column_alias(name):
+    # "Lokasi LM" -> "lokasilm", supaya bisa ditulis lokasi_lm:... atau lokasilm:...
+    return re.sub(r"[\s_]+", "", str(name).casefold())
+
+
+def _ngram_codes(raw):
+    # raw: array uint8 (utf-8); tiap trigram dikodekan jadi satu uint32
+    raw = raw.astype(np.uint32)
+    return (raw[:-2] << 16) | (raw[1:-1] << 8) | raw[2:]
+
+
+class ColumnIndex:
+    def __init__(self, series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Kategori sudah berupa kode + nilai unik: tidak perlu mengubah tiap baris jadi teks
+            uniques = list(series.cat.categories.astype(str)) + [""]
+            codes = series.cat.codes.to_numpy().astype(np.int64)
+            codes[codes < 0] = len(uniques) - 1
+        else:
+            # Teks sama seperti astype(str) lama, tetapi sel kosong tidak ikut cocok dengan "nan"
+            text = series.astype(str).where(series.notna(), "")
+            codes, uniques = pd.factorize(text)
+        self.values = [str(v).casefold().replace("\x00", "") for v in uniques]
+
+        # Daftar baris per nilai unik (format CSR): baris nilai ke-i = rows[offsets[i]:offsets[i+1]]
+        self.rows = np.argsort(codes, kind="stable").astype(np.int32)
+        counts = np.bincount(codes, minlength=len(self.values))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._build_ngrams()
+
+    def _build_ngrams(self):
+        encoded = [v.encode("utf-8") for v in self.values]
+        lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+        raw = np.frombuffer(b"\x00".join(encoded) + b"\x00", dtype=np.uint8)
+        if len(raw) < NGRAM:
+            return self._no_ngrams()
+        value_ids = np.repeat(np.arange(len(encoded), dtype=np.int64), lengths + 1)
+
+        grams = _ngram_codes(raw)
+        # Buang trigram yang melewati pemisah antar nilai
+        valid = (raw[:-2] != 0) & (raw[1:-1] != 0) & (raw[2:] != 0)
+        pairs = (grams[valid].astype(np.int64) << 32) | value_ids[:-2][valid]
+        if not len(pairs):
+            # Semua nilai lebih pendek dari NGRAM (mis. kolom nomor urut 1-34)
+            return self._no_ngrams()
+        # Urut + buang duplikat (lebih cepat daripada np.unique berbasis hash)
+        pairs.sort()
+        pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]
+
+        gram_part = (pairs >> 32).astype(np.uint32)
+        starts = np.flatnonzero(np.concatenate([[True], gram_part[1:] != gram_part[:-1]]))
+        self.gram_keys = gram_part[starts]
+        self.gram_offsets = np.append(starts, len(pairs))
+        self.postings = (pairs & 0xFFFFFFFF).astype(np.int32)
+
+    def _no_ngrams(self):
+        self.gram_keys = np.empty(0, dtype=np.uint32)
+        self.gram_offsets = np.zeros(1, dtype=np.int64)
+        self.postings = np.empty(0, dtype=np.int32)
+
+    def _candidates(self, term):
+        grams = np.unique(_ngram_codes(np.frombuffer(term.encode("utf-8"), dtype=np.uint8)))
+        pos = np.searchsorted(self.gram_keys, grams)
+        if (pos >= len(self.gram_keys)).any() or (self.gram_keys[np.minimum(pos, len(self.gram_keys) - 1)] != grams).any():
+            return np.empty(0, dtype=np.int32)
+        lists = sorted(
+            (self.postings[self.gram_offsets[p]:self.gram_offsets[p + 1]] for p in pos), key=len
+        )
+        result = lists[0]
+        for other in lists[1:]:
+            result = np.intersect1d(result, other, assume_unique=True)
+            if not len(result):
+                break
+        return result
+
+    def match_values(self, term, prefix=False):
+        if len(term.encode("utf-8")) < NGRAM:
+            candidates = range(len(self.values))
+        else:
+            candidates = self._candidates(term)
+        values = self.values
+        if prefix:
+            return [i for i in candidates if values[i].startswith(term)]
+        return [i for i in candidates if term in values[i]]
+
+    def match_rows(self, term, prefix=False):
+        ids = self.match_values(term, prefix)
+        if not ids:
+            return np.empty(0, dtype=np.int32)
+        return np.sort(np.concatenate([self.rows[self.offsets[i]:self.offsets[i + 1]] for i in ids]))
+
+
+class SearchIndex:
+    def __init__(self, df, columns=None):
+        self.n_rows = len(df)
+        self.columns = {c: ColumnIndex(df[c]) for c in (columns or df.columns)}
+        self._aliases = {_column_alias(c): c for c in self.columns}
+
+    def parse(self, query):
+        # Pisahkan term berkolom (Asisten:budi, "Lokasi LM" ditulis lokasi_lm:bogor) dari teks bebas
+        scoped = []
+
+        def take(m):
+            col = self._aliases.get(_column_alias(m.group(1)))
+            if col is None:
+                return m.group(0)
+            scoped.append((col, m.group(2).strip('"')))
+            return " "
+
+        free = " ".join(SCOPED_TERM.sub(take, query).split())
+        return scoped, free
+
+    @staticmethod
+    def _term(text):
+        text = text.casefold()
+        if text.endswith("*"):
+            return text[:-1], True
+        return text, False
+
+    def search(self, query):
+        # Hasil: array posisi baris (terurut) yang cocok; None bila kueri kosong
+        scoped, free = self.parse(query)
+        result = None
+        for col, text in scoped:
+            term, prefix = self._term(text)
+            ids = self.columns[col].match_rows(term, prefix)
+            result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+        if free:
+            term, prefix = self._term(free)
+            ids = np.unique(np.concatenate(
+                [idx.match_rows(term, prefix) for idx in self.columns.values()] or [np.empty(0, dtype=np.int32)]
+            ))
+            result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def mask(self, query):
+        ids = self.search(query)
+        mask = np.ones(self.n_rows, dtype=bool) if ids is None else np.zeros(self.n_rows, dtype=bool)
+        if ids is not None:
+            mask[ids] = True
+        return mask
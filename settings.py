@@ -0,0 +1,24 @@
+import os
+from pathlib import Path
+
+# Lokasi direktori cache lokal (geocoding, snapshot data, dsb).
+# Bisa diganti lewat environment variable saat deploy.
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_DIR = Path(os.environ.get("OMBUDSMAN_CACHE_DIR", BASE_DIR / ".cache"))
+DATA_DIR = BASE_DIR / "data"
+
+# Sumber data utama: "gsheets" (Google Sheet, cadangan workbook lokal) atau "excel" (workbook saja)
+DATA_SOURCE = os.environ.get("OMBUDSMAN_DATA_SOURCE", "gsheets")
+EXCEL_DIR = Path(os.environ.get("OMBUDSMAN_EXCEL_DIR", BASE_DIR))
+
+# Akun yang boleh melihat panel instrumentasi performa (dipisah koma)
+ADMIN_USERS = set(os.environ.get("OMBUDSMAN_ADMIN_USERS", "admin").split(","))
+
+# Biaya hashing password (scrypt N, pangkat dua) dan masa berlaku token sesi login
+SCRYPT_N = int(os.environ.get("OMBUDSMAN_SCRYPT_N", 2 ** 14))
+SESSION_TTL_HOURS = float(os.environ.get("OMBUDSMAN_SESSION_TTL_HOURS", 12))
+
+
+def cache_path(name):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return CACHE_DIR / name
@@ -0,0 +1,86 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from cube import is_done
+from sync import DATE_COLUMN
+
+# Kelompok umur kasus (hari): (batas bawah, batas atas inklusif / None = tak terbatas, label)
+DEFAULT_BUCKETS = [
+    (0, 14, '0–14 hari'),
+    (15, 30, '15–30 hari'),
+    (31, 60, '31–60 hari'),
+    (61, None, '>60 hari'),
+]
+DEFAULT_SLA_DAYS = 30
+
+
+@dataclass
+class SlaPolicy:
+    # Batas SLA (hari); aturan per Asisten lebih diutamakan daripada aturan per Status
+    default_days: int = DEFAULT_SLA_DAYS
+    per_status: dict = field(default_factory=dict)
+    per_asisten: dict = field(default_factory=dict)
+    buckets: list = field(default_factory=lambda: list(DEFAULT_BUCKETS))
+
+    def thresholds(self, df):
+        limit = np.full(len(df), self.default_days, dtype=np.int32)
+        for col, rules in (('Status', self.per_status), ('Asisten', self.per_asisten)):
+            if rules and col in df.columns:
+                mapped = df[col].map(rules).astype('float').to_numpy()
+                has_rule = ~np.isnan(mapped)
+                limit[has_rule] = mapped[has_rule]
+        return limit
+
+
+def case_age_days(dates, today):
+    # Umur kasus dalam hari (int32); -1 untuk tanggal kosong
+    days = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    valid = ~np.isnat(days)
+    age = np.full(len(days), -1, dtype=np.int32)
+    age[valid] = (np.datetime64(today, 'D') - days[valid]).astype(np.int32)
+    return age
+
+
+@dataclass
+class SlaReport:
+    age: np.ndarray
+    open_mask: np.ndarray
+    overdue_mask: np.ndarray
+    bucket_labels: list
+    backlog: pd.DataFrame
+
+    @property
+    def overdue(self):
+        return int(self.overdue_mask.sum())
+
+    @property
+    def open_cases(self):
+        return int(self.open_mask.sum())
+
+
+def build_sla_report(df, today, policy=None, group_col='Asisten'):
+    policy = policy or SlaPolicy()
+    labels = [label for _, _, label in policy.buckets]
+    if df.empty or DATE_COLUMN not in df.columns:
+        empty = np.zeros(len(df), dtype=bool)
+        return SlaReport(np.full(len(df), -1, dtype=np.int32), empty, empty, labels,
+                         pd.DataFrame(columns=labels))
+
+    age = case_age_days(df[DATE_COLUMN], today)
+    open_mask = (age >= 0) & ~(is_done(df['Status']) if 'Status' in df.columns else False)
+    overdue_mask = open_mask & (age > policy.thresholds(df))
+
+    # Batas bawah tiap kelompok -> indeks kelompok lewat np.digitize
+    edges = np.array([low for low, _, _ in policy.buckets[1:]])
+    bucket = np.digitize(age, edges)
+    groups = df[group_col].astype(object).fillna('-').to_numpy() if group_col in df.columns \
+        else np.full(len(df), 'Semua')
+    backlog = (pd.crosstab(groups[open_mask], bucket[open_mask])
+               .reindex(columns=range(len(labels)), fill_value=0))
+    backlog.columns = labels
+    backlog.index.name = group_col if group_col in df.columns else None
+    backlog['Lewat SLA'] = pd.Series(overdue_mask[open_mask]).groupby(groups[open_mask]).sum() \
+        .reindex(backlog.index, fill_value=0).astype(int)
+    return SlaReport(age, open_mask, overdue_mask, labels, backlog)
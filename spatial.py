@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+# Tingkat agregasi peta: None = satu penanda per titik lokasi hasil geocoding (wilayah),
+# angka = ukuran sel grid dalam derajat
+MAP_LEVELS = {
+    "Wilayah (per lokasi)": None,
+    "Grid 0,5°": 0.5,
+    "Grid 2°": 2.0,
+}
+# Kolom hasil aggregate_points (juga saat tidak ada satu pun laporan berkoordinat)
+CELL_COLUMNS = ['lat', 'lon', 'Jumlah', 'Status Dominan', 'Wilayah', 'Rincian Status']
+
+
+def aggregate_points(df, cell_deg=None, status_col='Status', label_col='Lokasi LM'):
+    # Hasil: satu baris per sel dengan jumlah laporan per status; ukuran payload peta
+    # bergantung pada jumlah sel, bukan jumlah laporan.
+    located = df[df['lat'].notna() & df['lon'].notna()]
+    if located.empty:
+        return pd.DataFrame(columns=CELL_COLUMNS)
+
+    lat = located['lat'].to_numpy()
+    lon = located['lon'].to_numpy()
+    if cell_deg:
+        keys = pd.DataFrame({'cy': np.floor(lat / cell_deg), 'cx': np.floor(lon / cell_deg)}, index=located.index)
+    else:
+        keys = pd.DataFrame({'cy': lat, 'cx': lon}, index=located.index)
+    key_cols = ['cy', 'cx']
+
+    frame = keys.assign(lat=lat, lon=lon)
+    frame['status'] = located[status_col].astype(object).fillna('-') if status_col in located.columns else 'Semua'
+    frame['label'] = located[label_col].astype(object).fillna('-') if label_col in located.columns else '-'
+
+    cells = frame.groupby(key_cols).agg(lat=('lat', 'mean'), lon=('lon', 'mean'), Jumlah=('lat', 'size'))
+    per_status = frame.groupby(key_cols + ['status']).size().unstack(fill_value=0).reindex(cells.index)
+    cells['Status Dominan'] = per_status.idxmax(axis=1)
+
+    # Nama wilayah terbanyak di sel (+ jumlah wilayah lain bila sel grid mencakup beberapa lokasi)
+    labels = frame.groupby(key_cols + ['label']).size().sort_values(ascending=False).reset_index()
+    first = labels.drop_duplicates(subset=key_cols).set_index(key_cols)['label'].reindex(cells.index)
+    n_labels = labels.groupby(key_cols).size().reindex(cells.index)
+    cells['Wilayah'] = first + np.where(n_labels > 1, " (+" + (n_labels - 1).astype(str) + " wilayah)", "")
+
+    cells['Rincian Status'] = [
+        "<br>".join(f"{status}: {count}" for status, count in row.items() if count)
+        for row in per_status.to_dict(orient='records')
+    ]
+    return cells.reset_index(drop=True).sort_values('Jumlah', ascending=False, ignore_index=True)
+
+
+def unlocated_count(df):
+    return int((df['lat'].isna() | df['lon'].isna()).sum())
@@ -0,0 +1,214 @@
+import json
+import os
+import threading
+import traceback
+from datetime import date, datetime
+from functools import cached_property
+
+import pandas as pd
+import pyarrow as pa
+
+from columnar import compact_frame, memory_report
+from cube import ComplaintCube
+from filters import FilterEngine
+from geocoding import add_coordinates
+from perf import Profiler
+from search_index import SearchIndex
+from settings import cache_path
+from sla import build_sla_report
+from table import TableView
+
+REFRESH_INTERVAL = 600
+
+
+class Snapshot:
+    # Satu versi data yang sudah siap pakai (geocoding + indeks + agregasi).
+    # Tidak pernah diubah setelah diterbitkan; semua sesi membaca objek yang sama.
+    def __init__(self, data, columns, has_date, version, notice=None, built_at=None, memory=None):
+        self.data = data
+        self.columns = list(columns)
+        self.has_date = has_date
+        self.version = version
+        self.notice = notice
+        self.built_at = built_at or datetime.now().isoformat(timespec='seconds')
+        # Laporan memori (byte/baris sebelum & sesudah compact_frame), None bila tidak tersedia
+        self.memory = memory
+        self._sla = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def empty(cls, notice=None):
+        return cls(pd.DataFrame(), [], False, "", notice)
+
+    @cached_property
+    def search_index(self):
+        return SearchIndex(self.data, columns=[c for c in self.columns if c in self.data.columns])
+
+    @cached_property
+    def filter_engine(self):
+        return FilterEngine(self.data)
+
+    @cached_property
+    def cube(self):
+        return ComplaintCube.from_frame(self.data, self.has_date, self.filter_engine)
+
+    @cached_property
+    def table_view(self):
+        return TableView(self.data)
+
+    def sla_report(self, today):
+        # Umur kasus hanya berubah sekali sehari: disimpan per tanggal
+        with self._lock:
+            if today not in self._sla:
+                self._sla = {today: build_sla_report(self.data, today)}
+            return self._sla[today]
+
+    def warm(self, today=None, prof=None):
+        # Dipanggil worker sebelum terbit agar sesi tidak menanggung biaya pembangunan
+        prof = prof or Profiler(label="warm")
+        for name in ['search_index', 'filter_engine', 'cube', 'table_view']:
+            with prof.stage(name):
+                getattr(self, name)
+        with prof.stage("sla"):
+            self.sla_report(today or date.today())
+        return self
+
+
+def build_snapshot(sources, geocoder, previous=None, prof=None):
+    # sources: [(nama, sumber dengan method sync())], dicoba berurutan sampai ada yang berhasil
+    prof = prof or Profiler(label="build")
+    errors = []
+    for name, source in sources:
+        try:
+            with prof.stage("load_data", source=name):
+                result = source.sync()
+        except Exception as e:
+            errors.append(f"{name} tidak dapat diakses: {e}.")
+            continue
+        notice = f"{errors[0]} Menampilkan data dari {name}." if errors else None
+        if previous is not None and previous.version == result.version and previous.notice == notice:
+            return previous
+        # compact_frame sudah membuat frame baru, jadi koordinat ditambahkan tanpa salinan tambahan
+        with prof.stage("compact", rows=len(result.data)):
+            data = compact_frame(result.data)
+            memory = memory_report(result.data, data)
+        if not data.empty:
+            with prof.stage("geocoding"):
+                data = add_coordinates(data, geocoder)
+        return Snapshot(data, result.data.columns, result.has_date, result.version, notice, memory=memory)
+    raise ConnectionError(" ".join(errors))
+
+
+class SnapshotStore:
+    # Snapshot terbaru disimpan sebagai file Arrow IPC (Feather v2) dan dibaca lewat memory-map,
+    # sehingga restart (atau proses lain di mesin yang sama) langsung punya data tanpa membangun ulang.
+    def __init__(self, directory=None, keep=3):
+        self.directory = directory or cache_path("snapshots")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+        self._current = None
+        try:
+            self._current = self.load_latest()
+        except Exception:
+            traceback.print_exc()
+
+    def current(self):
+        return self._current
+
+    def _pointer(self):
+        return self.directory / "current.json"
+
+    def publish(self, snapshot):
+        if snapshot is self._current:
+            return
+        if snapshot.version:
+            path = self.directory / f"{snapshot.version}.arrow"
+            if not path.exists():
+                table = pa.Table.from_pandas(snapshot.data, preserve_index=False)
+                tmp = path.with_suffix(".tmp")
+                with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+                os.replace(tmp, path)
+            meta = {'version': snapshot.version, 'columns': snapshot.columns, 'has_date': snapshot.has_date,
+                    'notice': snapshot.notice, 'built_at': snapshot.built_at,
+                    'memory': None if snapshot.memory is None else snapshot.memory.reset_index().to_dict('records')}
+            tmp = self._pointer().with_suffix(".tmp")
+            tmp.write_text(json.dumps(meta), encoding='utf-8')
+            os.replace(tmp, self._pointer())
+            self._prune(keep_version=snapshot.version)
+        self._current = snapshot
+
+    def load_latest(self):
+        if not self._pointer().exists():
+            return None
+        meta = json.loads(self._pointer().read_text(encoding='utf-8'))
+        path = self.directory / f"{meta['version']}.arrow"
+        if not path.exists():
+            return None
+        source = pa.memory_map(str(path), "r")
+        data = pa.ipc.open_file(source).read_all().to_pandas()
+        memory = pd.DataFrame(meta['memory']).set_index('Kolom') if meta.get('memory') else None
+        return Snapshot(data, meta['columns'], meta['has_date'], meta['version'], meta.get('notice'), meta.get('built_at'), memory)
+
+    def _prune(self, keep_version):
+        files = sorted(self.directory.glob("*.arrow"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in files[self.keep:]:
+            if old.stem != keep_version:
+                old.unlink(missing_ok=True)
+
+
+class RefreshWorker(threading.Thread):
+    # Thread latar: memuat, geocoding, dan pra-agregasi data sesuai jadwal lalu menerbitkan snapshot.
+    # build(previous, prof) mencatat tahapnya ke prof; profil run terakhir disimpan di last_profile.
+    def __init__(self, store, build, interval=REFRESH_INTERVAL):
+        super().__init__(name="ombudsman-refresh", daemon=True)
+        self.store = store
+        self.build = build
+        self.interval = interval
+        self.last_error = None
+        self.last_profile = None
+        self.runs = 0
+        # Generasi permintaan: run yang dimulai setelah permintaan ke-n menyelesaikan permintaan <= n.
+        # Run yang sudah berjalan saat tombol ditekan bisa membaca data sebelum perubahan pengguna.
+        self.requested = 0
+        self.completed = 0
+        self._wake = threading.Event()
+        self._done = threading.Condition()
+
+    def run(self):
+        while True:
+            self.refresh_once()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def refresh_once(self):
+        with self._done:
+            generation = self.requested
+        prof = Profiler(label="refresh")
+        try:
+            snapshot = self.build(self.store.current(), prof).warm(prof=prof)
+            with prof.stage("publish"):
+                self.store.publish(snapshot)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = e
+            traceback.print_exc()
+        self.last_profile = prof
+        with self._done:
+            self.runs += 1
+            self.completed = max(self.completed, generation)
+            self._done.notify_all()
+
+    def refresh(self, wait=True, timeout=120):
+        # Minta penyegaran segera (tombol "Tarik Data Terbaru"); opsional tunggu sampai selesai
+        with self._done:
+            self.requested += 1
+            target = self.requested
+        self._wake.set()
+        if wait:
+            with self._done:
+                self._done.wait_for(lambda: self.completed >= target, timeout=timeout)
+
+    def wait_first_run(self, timeout=None):
+        with self._done:
+            self._done.wait_for(lambda: self.runs >= 1, timeout=timeout)
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import warnings
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from settings import cache_path
+
+DATE_COLUMN = 'Tanggal Laporan'
+# Pengali untuk membedakan baris kembar (hash sama) berdasarkan urutan kemunculannya
+_OCCURRENCE_SALT = np.uint64(0x9E3779B97F4A7C15)
+# Jumlah nilai unik yang ditebak formatnya; format terpilih tetap diuji ke seluruh kolom
+DATE_FORMAT_SAMPLE = 200
+
+
+def detect_date_column(columns):
+    for col in columns:
+        if any(x in str(col).lower() for x in ['tanggal', 'tgl', 'date']):
+            return col
+    return None
+
+
+def detect_date_format(values):
+    # Format tanggal ditentukan sekali dari seluruh kolom. Tanpa format, pandas menebak dari nilai
+    # pertama tiap batch, sehingga "01/02/2024" bisa terbaca 2 Januari atau 1 Februari tergantung
+    # kapan barisnya masuk. Lembar pengaduan memakai urutan hari/bulan, jadi dayfirst=True.
+    text = pd.Series(values, dtype=object).dropna()
+    text = text[text.map(lambda v: isinstance(v, str))].str.strip()
+    best, parsed = None, 0
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        guesses = [guess_datetime_format(v, dayfirst=True) for v in text.unique()[:DATE_FORMAT_SAMPLE]]
+    for fmt in dict.fromkeys(g for g in guesses if g):
+        count = int(pd.to_datetime(text, format=fmt, errors='coerce').notna().sum())
+        if count > parsed:
+            best, parsed = fmt, count
+    return best
+
+
+def parse_rows(raw, date_col, date_format=None):
+    # Parsing hanya dijalankan untuk baris baru/berubah, dengan format milik seluruh kolom
+    df = raw.copy()
+    if date_col is not None:
+        df[date_col] = pd.to_datetime(df[date_col], format=date_format, errors='coerce')
+        df = df.rename(columns={date_col: DATE_COLUMN})
+    return df
+
+
+def row_keys(raw):
+    hashes = pd.util.hash_pandas_object(raw, index=False).to_numpy()
+    occurrence = pd.Series(hashes).groupby(hashes).cumcount().to_numpy().astype(np.uint64)
+    return hashes ^ (occurrence * _OCCURRENCE_SALT)
+
+
+def _arrow_safe(df):
+    # Parquet menolak kolom object bercampur (mis. angka & teks); samakan jadi teks
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].map(lambda v: v if isinstance(v, str) or pd.isna(v) else str(v))
+    return df
+
+
+@dataclass
+class SyncResult:
+    data: pd.DataFrame
+    has_date: bool
+    version: str
+    stats: dict = field(default_factory=dict)
+
+
+class SheetSync:
+    def __init__(self, source, name="sheet"):
+        self.source = source
+        self.snapshot_path = cache_path(f"{name}_snapshot.parquet")
+        self.meta_path = cache_path(f"{name}_snapshot.json")
+
+    def _load_snapshot(self, columns):
+        if not (self.snapshot_path.exists() and self.meta_path.exists()):
+            return None, None
+        meta = json.loads(self.meta_path.read_text(encoding='utf-8'))
+        # Struktur kolom sheet berubah (atau snapshot lama tanpa format tanggal) -> tidak bisa dipakai ulang
+        if meta.get('columns') != [str(c) for c in columns] or 'date_format' not in meta:
+            return None, None
+        try:
+            snapshot = pd.read_parquet(self.snapshot_path)
+        except Exception:
+            return None, None
+        return snapshot, meta
+
+    def _save_snapshot(self, df, meta):
+        tmp = self.snapshot_path.with_suffix('.tmp')
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.snapshot_path)
+        self.meta_path.write_text(json.dumps(meta), encoding='utf-8')
+
+    def sync(self):
+        raw = self.source.read().dropna(how="all").reset_index(drop=True)
+        date_col = detect_date_column(raw.columns)
+        keys = row_keys(raw)
+        version = hashlib.sha1(keys.tobytes() + repr(list(raw.columns)).encode()).hexdigest()[:16]
+
+        snapshot, meta = self._load_snapshot(raw.columns)
+        if meta is not None and meta.get('version') == version:
+            data = snapshot.drop(columns='_key')
+            return SyncResult(data, date_col is not None, version,
+                              {'new': 0, 'reused': len(data), 'removed': 0})
+
+        # Format tersimpan dipakai untuk setiap batch delta; bila kolom baru bisa ditebak formatnya
+        # (mis. sebelumnya kosong) atau berbeda, seluruh baris di-parse ulang dengan format baru.
+        date_format = meta.get('date_format') if meta is not None else None
+        if date_col is not None and date_format is None:
+            date_format = detect_date_format(raw[date_col])
+        if meta is not None and meta['date_format'] != date_format:
+            snapshot = None
+
+        if snapshot is not None:
+            positions = pd.Index(snapshot['_key'].to_numpy()).get_indexer(keys)
+        else:
+            positions = np.full(len(keys), -1)
+        known = positions >= 0
+
+        parsed_new = parse_rows(raw[~known], date_col, date_format)
+        parts = [parsed_new.set_index(np.flatnonzero(~known))]
+        if known.any():
+            reused = snapshot.iloc[positions[known]].drop(columns='_key')
+            parts.append(reused.set_index(np.flatnonzero(known)))
+        data = pd.concat(parts).sort_index()
+        data = _arrow_safe(data[parsed_new.columns])
+
+        stats = {
+            'new': int((~known).sum()),
+            'reused': int(known.sum()),
+            'removed': (len(snapshot) - int(known.sum())) if snapshot is not None else 0,
+        }
+        self._save_snapshot(data.assign(_key=keys), {
+            'columns': [str(c) for c in raw.columns],
+            'version': version,
+            'date_format': date_format,
+            'synced_at': datetime.now().isoformat(timespec='seconds'),
+            'stats': stats,
+        })
+        return SyncResult(data, date_col is not None, version, stats)
@@ -0,0 +1,53 @@
+import math
+
+import numpy as np
+
+# Kolom teknis yang tidak perlu ditampilkan di tabel detail
+HIDDEN_COLUMNS = ['lat', 'lon', 'Hari_Berjalan', 'ni', 'Ni', 'NI', 'maladministrasi', 'Maladministrasi', 'Jenis Maladministrasi']
+PREFERRED_COLUMNS = ['Nomor Arsip', 'Nama Pelapor', 'Lokasi LM', 'Asisten', 'Status', 'Tanggal Laporan', 'Tahun']
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+class TableView:
+    # Data tetap di server; yang dikirim ke browser hanya potongan satu halaman.
+    # Indeks urutan per kolom dihitung sekali untuk seluruh data lalu dipakai ulang untuk tiap filter.
+    def __init__(self, df):
+        self.frame = df.reset_index(drop=True)
+        visible = [c for c in self.frame.columns if c not in HIDDEN_COLUMNS]
+        preferred = [c for c in PREFERRED_COLUMNS if c in visible]
+        self.columns = preferred + [c for c in visible if c not in preferred]
+        self._sort_index = {}
+
+    def sort_index(self, column, ascending=True):
+        key = (column, ascending)
+        if key not in self._sort_index:
+            values = self.frame[column]
+            try:
+                ordered = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+            except TypeError:
+                # Kolom campuran (angka & teks) diurutkan sebagai teks
+                ordered = values.astype(str).where(values.notna()).sort_values(
+                    ascending=ascending, kind='stable', na_position='last')
+            self._sort_index[key] = ordered.index.to_numpy()
+        return self._sort_index[key]
+
+    def order(self, positions, sort_by=None, ascending=True):
+        # positions: posisi baris (di frame penuh) yang lolos filter
+        positions = np.asarray(positions)
+        if sort_by is None or sort_by not in self.frame.columns:
+            return np.sort(positions)
+        selected = np.zeros(len(self.frame), dtype=bool)
+        selected[positions] = True
+        index = self.sort_index(sort_by, ascending)
+        return index[selected[index]]
+
+    @staticmethod
+    def n_pages(n_rows, page_size):
+        return max(1, math.ceil(n_rows / page_size))
+
+    def page(self, ordered, page, page_size):
+        start = (page - 1) * page_size
+        return self.frame.iloc[ordered[start:start + page_size]][self.columns]
+
+    def rows(self, positions):
+        return self.frame.iloc[np.sort(np.asarray(positions))][self.columns]
@@ -0,0 +1,20 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+# Cache (geocoding, snapshot, ekspor) diarahkan ke folder sementara sebelum settings diimpor
+os.environ.setdefault("OMBUDSMAN_CACHE_DIR", tempfile.mkdtemp(prefix="ombudsman-test-"))
+
+WORKBOOKS = [ROOT / 'data_tanah.xlsx', ROOT / 'data_tanah1.xlsx']
+
+
+@pytest.fixture(scope='session')
+def workbook_data():
+    # Isi workbook contoh apa adanya (semua kolom, termasuk kolom nomor urut pendek)
+    return pd.concat([pd.read_excel(f) for f in WORKBOOKS], ignore_index=True)
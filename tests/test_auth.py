@@ -0,0 +1,63 @@
+import os
+import stat
+
+import pytest
+
+from auth import TokenSigner, UserExists, UserStore, load_secret
+from settings import cache_path
+
+FAST_N = 2 ** 8
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="mode file POSIX")
+def test_secret_and_user_db_are_private(tmp_path, monkeypatch):
+    monkeypatch.delenv("OMBUDSMAN_SECRET_KEY", raising=False)
+    UserStore(tmp_path / "users.sqlite3", n=FAST_N, seed=None)
+    assert mode(tmp_path / "users.sqlite3") == 0o600
+    assert len(load_secret()) == 32
+    assert mode(cache_path("session.key")) == 0o600
+
+
+def test_verify_and_rehash_on_cost_change(tmp_path):
+    path = tmp_path / "users.sqlite3"
+    old = UserStore(path, n=FAST_N, seed={"admin": "rahasia"})
+    assert old.verify("admin", "rahasia")
+    assert not old.verify("admin", "salah")
+    assert not old.verify("tamu", "rahasia")
+    with pytest.raises(UserExists):
+        old.create("admin", "lain")
+
+    # SCRYPT_N dinaikkan: login berikutnya menyimpan ulang hash dengan biaya baru
+    new = UserStore(path, n=FAST_N * 2, seed=None)
+    assert new._conn.execute("SELECT n FROM users").fetchone()[0] == FAST_N
+    assert new.verify("admin", "rahasia")
+    assert new._conn.execute("SELECT n FROM users").fetchone()[0] == FAST_N * 2
+    assert new.verify("admin", "rahasia")
+    assert not new.verify("admin", "salah")
+
+
+def test_token_roundtrip_and_expiry():
+    signer = TokenSigner(secret=b"kunci-uji", ttl_hours=1)
+    token = signer.issue("admin", now=1_000_000)
+    assert signer.verify(token, now=1_000_000 + 3599) == "admin"
+    assert signer.verify(token, now=1_000_000 + 3601) is None
+    # Kunci lain (mis. setelah kunci diganti) tidak menerima token lama
+    assert TokenSigner(secret=b"kunci-lain").verify(token, now=1_000_000) is None
+
+
+@pytest.mark.parametrize('token', [None, "", "tanpa-titik", "a.b.c", "!!!.xyz", "YWRtaW4.", ".abc"])
+def test_malformed_tokens_are_rejected(token):
+    assert TokenSigner(secret=b"kunci-uji").verify(token) is None
+
+
+def test_tampered_token_is_rejected():
+    signer = TokenSigner(secret=b"kunci-uji", ttl_hours=1)
+    body, signature = signer.issue("tamu", now=1_000_000).split(".")
+    forged = TokenSigner(secret=b"kunci-uji", ttl_hours=1000).issue("admin", now=1_000_000).split(".")[0]
+    assert signer.verify(f"{forged}.{signature}", now=1_000_000) is None
+    flipped = signature[:-1] + ("A" if signature[-1] != "A" else "B")
+    assert signer.verify(f"{body}.{flipped}", now=1_000_000) is None
@@ -0,0 +1,78 @@
+import sys
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from columnar import compact_frame
+from conftest import ROOT
+from cube import ComplaintCube, is_done, split_period
+from filters import FilterEngine
+
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+from synthetic import make_dataset  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def data():
+    return compact_frame(make_dataset(20_000, seed=1))
+
+
+def expected_rows(df, start=None, end=None, **equals):
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df['Tanggal Laporan'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df['Tanggal Laporan'] < pd.Timestamp(end) + pd.Timedelta(days=1)
+    for col, value in equals.items():
+        mask &= df[col].isin(value if isinstance(value, list) else [value])
+    return df[mask]
+
+
+def test_split_period():
+    assert split_period(date(2024, 1, 10), date(2024, 3, 15)) == (
+        pd.Timestamp('2024-02-01'), pd.Timestamp('2024-03-01'),
+        [(pd.Timestamp('2024-01-10'), pd.Timestamp('2024-01-31')), (pd.Timestamp('2024-03-01'), pd.Timestamp('2024-03-15'))])
+    assert split_period(date(2024, 1, 1), date(2024, 2, 29)) == (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-03-01'), [])
+    # Awal dan akhir di bulan yang sama: satu potongan saja
+    assert split_period(date(2024, 1, 10), date(2024, 1, 20))[2] == [(pd.Timestamp('2024-01-10'), pd.Timestamp('2024-01-20'))]
+    assert split_period(None, date(2024, 1, 20)) == (None, pd.Timestamp('2024-01-01'),
+                                                     [(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-20'))])
+
+
+def test_cells_are_monthly(data):
+    cube = ComplaintCube.from_frame(data, True)
+    assert 'Tanggal' not in cube.cells.columns
+    assert (cube.cells['Bulan'].dt.day == 1).all()
+    assert cube.total() == len(data)
+    # Jumlah sel tidak ikut tumbuh dengan jumlah laporan
+    doubled = ComplaintCube.from_frame(pd.concat([data, data], ignore_index=True), True)
+    assert len(doubled.cells) == len(cube.cells)
+    assert doubled.total() == 2 * len(data)
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'start': date(2022, 1, 1), 'end': date(2023, 12, 31)},
+    {'start': date(2022, 3, 17), 'end': date(2024, 6, 3), 'Asisten': 'Sigit'},
+    {'start': date(2023, 5, 10), 'end': date(2023, 5, 20), 'Status': ['Selesai', 'Tutup']},
+    {'start': date(2025, 2, 14)},
+    {'end': date(2021, 8, 9), 'Lokasi LM': 'Bogor'},
+], ids=repr)
+def test_filter_matches_rows(data, filters):
+    cube = ComplaintCube.from_frame(data, True, FilterEngine(data)).filter(**filters)
+    rows = expected_rows(data, **filters)
+    assert cube.total() == len(rows)
+    assert cube.selesai() == int(is_done(rows['Status']).sum())
+    by_year = rows.groupby('Tahun', observed=True).size()
+    assert cube.counts_by('Tahun').to_dict() == by_year[by_year > 0].to_dict()
+    trend = rows.set_index('Tanggal Laporan').resample('ME').size()
+    pd.testing.assert_series_equal(cube.monthly_trend().set_index('Tanggal Laporan')['Jumlah Laporan'], trend,
+                                   check_names=False, check_freq=False)
+
+
+def test_year_from_date_when_no_tahun_column(data):
+    cube = ComplaintCube.from_frame(data.drop(columns='Tahun'), True)
+    assert 'Tahun' not in cube.dims
+    expected = data['Tanggal Laporan'].dt.year.value_counts().sort_index()
+    assert cube.by_year()['Jumlah Laporan'].tolist() == expected.tolist()
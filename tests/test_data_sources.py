@@ -0,0 +1,38 @@
+import os
+
+import pandas as pd
+
+from data_sources import ExcelDirectorySource
+
+
+def write_workbook(path, rows, mtime):
+    pd.DataFrame(rows, columns=['Nomor Arsip', 'Nama Pelapor', 'Status', 'Tanggal Laporan']).to_excel(path, index=False)
+    os.utime(path, (mtime, mtime))
+
+
+def test_newest_file_wins_but_duplicates_within_file_are_kept(tmp_path):
+    write_workbook(tmp_path / 'lama.xlsx', [
+        ['001/LM', 'Andi', 'Proses', '2024-01-02'],
+        ['002/LM', 'Budi', 'Proses', '2024-01-03'],
+        [None, 'Tanpa Nomor', 'Proses', '2024-01-04'],
+    ], mtime=1_700_000_000)
+    write_workbook(tmp_path / 'baru.xlsx', [
+        ['001/LM', 'Andi', 'Selesai', '2024-01-02'],
+        # Nomor Arsip sama di satu file: dua laporan berbeda, keduanya dipertahankan
+        ['003/LM', 'Citra', 'Proses', '2024-02-01'],
+        ['003/LM', 'Dewi', 'Proses', '2024-02-05'],
+        [None, 'Tanpa Nomor', 'Proses', '2024-01-04'],
+    ], mtime=1_700_000_100)
+
+    data = ExcelDirectorySource(tmp_path).sync().data
+
+    assert sorted(data['Nama Pelapor']) == ['Andi', 'Budi', 'Citra', 'Dewi', 'Tanpa Nomor']
+    assert data.loc[data['Nomor Arsip'] == '001/LM', 'Status'].tolist() == ['Selesai']
+    assert (data['Nomor Arsip'] == '003/LM').sum() == 2
+
+
+def test_date_column_is_parsed(tmp_path):
+    write_workbook(tmp_path / 'a.xlsx', [['001/LM', 'Andi', 'Proses', '2024-01-02']], mtime=1_700_000_000)
+    result = ExcelDirectorySource(tmp_path).sync()
+    assert result.has_date
+    assert pd.api.types.is_datetime64_any_dtype(result.data['Tanggal Laporan'])
@@ -0,0 +1,34 @@
+import threading
+
+import pandas as pd
+
+from export import build_export, filter_signature
+
+
+def test_concurrent_builds_of_same_artifact():
+    # Beberapa sesi menekan unduh pada tampilan yang sama sesaat setelah data diperbarui
+    df = pd.DataFrame({'Nomor Arsip': [f"{i:04d}/LM" for i in range(2000)], 'Status': 'Proses'})
+    signature = filter_signature("concurrent", "csv")
+    barrier = threading.Barrier(4)
+    results, errors = [], []
+
+    def rows():
+        barrier.wait(5)
+        return df
+
+    def build():
+        try:
+            results.append(build_export(rows, 'csv', signature))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=build) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(set(results)) == 1
+    pd.testing.assert_frame_equal(pd.read_csv(results[0]), df)
+    assert not list(results[0].parent.glob("*.tmp"))
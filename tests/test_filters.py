@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from columnar import compact_frame
+from filters import FilterEngine
+from search_index import SearchIndex
+
+
+def old_filter(df, start=None, end=None, query=None, asisten=None, wilayah=None, status=None):
+    # Rantai filter dashboard sebelum FilterEngine (salinan DataFrame per langkah)
+    filtered = df.copy()
+    if start and end:
+        filtered = filtered[(filtered['Tanggal Laporan'].dt.date >= start) & (filtered['Tanggal Laporan'].dt.date <= end)]
+    if query:
+        mask = filtered.astype(str).apply(lambda x: x.str.contains(query, case=False, regex=False)).any(axis=1)
+        filtered = filtered[mask]
+    if asisten:
+        filtered = filtered[filtered['Asisten'] == asisten]
+    if wilayah:
+        filtered = filtered[filtered['Lokasi LM'] == wilayah]
+    if status:
+        filtered = filtered[filtered['Status'].isin(status)]
+    return filtered.index.to_numpy()
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'start': date(2024, 2, 1), 'end': date(2024, 3, 15)},
+    {'asisten': 'Sigit'},
+    {'status': ['Selesai', 'Proses']},
+    {'query': 'bogor'},
+    {'query': 'jakarta', 'asisten': 'Wildan', 'status': ['Berproses']},
+    {'start': date(2024, 1, 15), 'end': date(2024, 2, 10), 'status': ['Selesai']},
+    {'asisten': 'Tidak Ada'},
+], ids=repr)
+def test_select_matches_old_mask(workbook_data, filters):
+    data = compact_frame(workbook_data)
+    engine, index = FilterEngine(data), SearchIndex(data)
+    equals = {k: v for k, v in {'Asisten': filters.get('asisten'), 'Lokasi LM': filters.get('wilayah'),
+                                'Status': filters.get('status')}.items() if v}
+    positions = engine.select(filters.get('start'), filters.get('end'), query=filters.get('query'),
+                              search=index.search, **equals)
+    # Seperti load_data lama: tanggal sudah di-parse sebelum difilter
+    raw = workbook_data.assign(**{'Tanggal Laporan': pd.to_datetime(workbook_data['Tanggal Laporan'])})
+    expected = old_filter(raw, **filters)
+    assert list(positions) == list(expected)
+    # Kombinasi yang sama dijawab dari memo tanpa dihitung ulang
+    assert engine.select(filters.get('start'), filters.get('end'), query=filters.get('query'),
+                         search=None, **equals) is positions
+    assert not positions.flags.writeable
+
+
+def test_wilayah_matches_old_mask(workbook_data):
+    data = compact_frame(workbook_data)
+    engine = FilterEngine(data)
+    for wilayah in workbook_data['Lokasi LM'].dropna().unique():
+        expected = np.flatnonzero((workbook_data['Lokasi LM'] == wilayah).to_numpy())
+        assert list(engine.select(**{'Lokasi LM': wilayah})) == list(expected)
+
+
+def test_memo_shared_between_threads(workbook_data):
+    engine = FilterEngine(compact_frame(workbook_data))
+    asisten = list(workbook_data['Asisten'].dropna().unique())
+    jobs = [{'Asisten': asisten[i % len(asisten)], 'Status': ['Berproses']} for i in range(2000)]
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda eq: engine.select(**eq), jobs))
+    for eq, positions in zip(jobs, results):
+        assert engine.select(**eq) is positions
+    assert len(engine._memo) == len(asisten)
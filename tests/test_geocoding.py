@@ -0,0 +1,32 @@
+from geocoding import UNRESOLVED, GeocodeCache, Geocoder, StaticBackend
+
+
+def make_geocoder(tmp_path, backend):
+    return Geocoder(cache=GeocodeCache(tmp_path / "geocode.sqlite"), backend=backend)
+
+
+def test_cached_keys_are_not_geocoded_again(tmp_path):
+    backend = StaticBackend({"Kab. Sleman": (-7.7, 110.35)})
+    first = make_geocoder(tmp_path, backend).resolve(["Kab. Sleman", "Antah Berantah"])
+    assert first["Kab. Sleman"] == (-7.7, 110.35)
+    assert len(backend.calls) == 2
+
+    # Penulisan berbeda tetapi kunci normalisasinya sama ("kab" -> "kabupaten")
+    second = make_geocoder(tmp_path, backend).resolve(["kabupaten sleman", "Antah Berantah", "Kota Bogor"])
+    assert second["kabupaten sleman"] == (-7.7, 110.35)
+    assert second["Antah Berantah"] == UNRESOLVED
+    assert backend.calls == ["Kab. Sleman", "Antah Berantah", "Kota Bogor"]
+
+
+def test_offline_falls_back_to_gazetteer_without_persisting(tmp_path):
+    offline = StaticBackend(offline=True)
+    coords = make_geocoder(tmp_path, offline).resolve(["Kota Bogor", "Jabar"])
+    assert coords == {"Kota Bogor": (-6.595, 106.8166), "Jabar": (-7.0909, 107.6689)}
+    # Setelah backend gagal, sisa batch tidak mencoba jaringan lagi
+    assert offline.calls == ["Kota Bogor"]
+    assert GeocodeCache(tmp_path / "geocode.sqlite").get_many(["kota bogor", "jawa barat"]) == {}
+
+    # Saat kembali online, kunci yang tadi hanya dijawab gazetteer ditanyakan ulang
+    online = StaticBackend({"Kota Bogor": (-6.6, 106.8)})
+    assert make_geocoder(tmp_path, online).resolve(["Kota Bogor"]) == {"Kota Bogor": (-6.6, 106.8)}
+    assert online.calls == ["Kota Bogor"]
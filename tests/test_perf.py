@@ -0,0 +1,38 @@
+import time
+import tracemalloc
+
+import perf
+from perf import MEMORY_REQUEST_TTL, Profiler, _update_tracing
+
+
+def test_other_sessions_do_not_stop_memory_tracing():
+    admin = Profiler(track_memory=True, owner="admin")
+    assert tracemalloc.is_tracing()
+    # Rerun sesi lain (tanpa "Ukur memori") tidak mematikan pengukuran milik admin
+    Profiler(track_memory=False, owner="tamu")
+    assert tracemalloc.is_tracing()
+    with admin.stage("muat"):
+        data = [0] * 10_000
+    assert admin.records[0]['mem_peak_kb'] > 0
+    del data
+
+    Profiler(track_memory=False, owner="admin")
+    assert not tracemalloc.is_tracing()
+
+
+def test_abandoned_request_expires():
+    _update_tracing("tab-ditutup", True, now=time.monotonic() - MEMORY_REQUEST_TTL - 1)
+    assert tracemalloc.is_tracing()
+    Profiler(track_memory=False, owner="tamu")
+    assert not tracemalloc.is_tracing()
+    assert perf._memory_owners == {}
+
+
+def test_total_counts_top_level_stages_only():
+    prof = Profiler()
+    with prof.stage("filter"):
+        with prof.stage("search"):
+            time.sleep(0.01)
+    outer, inner = sorted(prof.records, key=lambda r: r['depth'])
+    assert (outer['stage'], inner['depth']) == ("filter", 1)
+    assert prof.total() == outer['seconds']
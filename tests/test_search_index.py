@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from columnar import compact_frame
+from conftest import WORKBOOKS
+from search_index import SearchIndex
+
+
+def old_mask(df, query):
+    # Perilaku pencarian sebelum SearchIndex
+    return df.astype(str).apply(lambda x: x.str.contains(query, case=False, regex=False)).any(axis=1)
+
+
+@pytest.mark.parametrize('path', WORKBOOKS, ids=lambda p: p.name)
+def test_builds_on_bundled_workbook(path):
+    # Kolom "No" berisi 1-34: semua nilai lebih pendek dari trigram
+    df = pd.read_excel(path)
+    for frame in (df, compact_frame(df)):
+        index = SearchIndex(frame)
+        assert index.search("bogor") is not None
+
+
+def test_short_values_only():
+    index = SearchIndex(pd.DataFrame({'No': [1, 2, 12, 34]}))
+    assert list(index.search("12")) == [2]
+    assert list(index.search("123")) == []
+
+
+@pytest.mark.parametrize('query', ['bogor', 'de', 'Jakarta Selatan', 'kantah', 'LM', '2024', 'tidak-ada'])
+def test_matches_old_mask(workbook_data, query):
+    expected = np.flatnonzero(old_mask(workbook_data, query).to_numpy())
+    assert list(SearchIndex(workbook_data).search(query)) == list(expected)
+
+
+def test_scoped_term_and_prefix(workbook_data):
+    index = SearchIndex(workbook_data)
+    asisten = workbook_data['Asisten'].astype(str)
+    expected = np.flatnonzero(asisten.str.contains('ika', case=False).to_numpy())
+    assert list(index.search('Asisten:ika')) == list(expected)
+    prefix = np.flatnonzero(asisten.str.lower().str.startswith('ri').to_numpy())
+    assert list(index.search('asisten:ri*')) == list(prefix)
+
+
+def test_empty_query_returns_none(workbook_data):
+    assert SearchIndex(workbook_data).search("  ") is None
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from charts import map_figure
+from spatial import CELL_COLUMNS, aggregate_points, unlocated_count
+
+
+def make_reports():
+    return pd.DataFrame({
+        'Lokasi LM': ['Bogor', 'Kab. Bogor', 'Bogor', 'Antah Berantah'],
+        'Status': ['Proses', 'Selesai', 'Proses', 'Proses'],
+        'lat': [-6.595, -6.48, -6.595, np.nan],
+        'lon': [106.8166, 106.9, 106.8166, np.nan],
+    })
+
+
+def test_cells_per_location_and_grid():
+    cells = aggregate_points(make_reports())
+    assert list(cells.columns) == CELL_COLUMNS
+    assert cells['Jumlah'].tolist() == [2, 1]
+    assert cells.loc[0, 'Rincian Status'] == "Proses: 2"
+
+    grid = aggregate_points(make_reports(), cell_deg=2.0)
+    assert grid['Jumlah'].tolist() == [3]
+    assert grid.loc[0, 'Wilayah'] == "Bogor (+1 wilayah)"
+    assert grid.loc[0, 'Status Dominan'] == "Proses"
+    assert map_figure(grid) is not None
+
+
+def test_all_unlocated():
+    # Mis. filter ke satu wilayah yang tidak dikenali geocoder: koordinat NaN semua
+    reports = make_reports().iloc[[3]]
+    cells = aggregate_points(reports)
+    assert cells.empty
+    assert list(cells.columns) == CELL_COLUMNS
+    assert unlocated_count(reports) == 1
+    map_figure(cells)
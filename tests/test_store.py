@@ -0,0 +1,55 @@
+import threading
+
+import pandas as pd
+
+from store import RefreshWorker, Snapshot, SnapshotStore
+
+
+def make_snapshot(version):
+    data = pd.DataFrame({'Asisten': pd.Categorical(['Sigit', 'Rika']), 'lat': [1.0, None], 'lon': [2.0, None]})
+    return Snapshot(data, ['Asisten'], False, version)
+
+
+def test_publish_and_reload(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.publish(make_snapshot("v1"))
+    reloaded = SnapshotStore(tmp_path).current()
+    assert reloaded.version == "v1"
+    pd.testing.assert_frame_equal(reloaded.data, store.current().data)
+
+
+def test_refresh_waits_for_run_started_after_request(tmp_path):
+    # Run yang sudah berjalan saat tombol ditekan tidak boleh dianggap memenuhi permintaan
+    started, release = threading.Event(), threading.Event()
+    builds = []
+
+    def build(previous, prof):
+        builds.append(len(builds) + 1)
+        if len(builds) == 1:
+            started.set()
+            release.wait(5)
+        return make_snapshot(f"v{len(builds)}")
+
+    store = SnapshotStore(tmp_path)
+    worker = RefreshWorker(store, build, interval=3600)
+    worker.start()
+    assert started.wait(5)
+
+    done = threading.Event()
+    threading.Thread(target=lambda: (worker.refresh(wait=True, timeout=5), done.set()), daemon=True).start()
+    release.set()
+    assert done.wait(5)
+    assert store.current().version == "v2"
+
+
+def test_refresh_records_build_profile(tmp_path):
+    def build(previous, prof):
+        with prof.stage("load_data", source="uji"):
+            snapshot = make_snapshot("v1")
+        return snapshot
+
+    worker = RefreshWorker(SnapshotStore(tmp_path), build)
+    worker.refresh_once()
+    stages = [r['stage'] for r in worker.last_profile.records]
+    assert stages == ["load_data", "search_index", "filter_engine", "cube", "table_view", "sla", "publish"]
+    assert worker.last_profile.total() > 0
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from data_sources import FakeSheetSource
+from sync import SheetSync
+
+
+def make_sheet():
+    return pd.DataFrame({
+        'Nomor Arsip': ['001/LM', '002/LM', '003/LM'],
+        'Status': ['Proses', 'Proses', 'Selesai'],
+        'Tanggal Laporan': ['2024-01-02', '2024-01-03', '2024-01-04'],
+    })
+
+
+def test_stats_after_append_update_and_delete():
+    source = FakeSheetSource(make_sheet())
+    sync = SheetSync(source, name="test_stats")
+
+    first = sync.sync()
+    assert first.stats == {'new': 3, 'reused': 0, 'removed': 0}
+    assert first.has_date
+
+    # Sheet tidak berubah: snapshot dipakai utuh
+    assert sync.sync().stats == {'new': 0, 'reused': 3, 'removed': 0}
+
+    source.append([{'Nomor Arsip': '004/LM', 'Status': 'Proses', 'Tanggal Laporan': '2024-01-05'}])
+    assert sync.sync().stats == {'new': 1, 'reused': 3, 'removed': 0}
+
+    # Baris yang diubah dihitung sebagai baris baru + baris lama yang hilang
+    source.df.loc[0, 'Status'] = 'Selesai'
+    assert sync.sync().stats == {'new': 1, 'reused': 3, 'removed': 1}
+
+    source.df = source.df.drop(index=1).reset_index(drop=True)
+    result = sync.sync()
+    assert result.stats == {'new': 0, 'reused': 3, 'removed': 1}
+    assert result.data['Nomor Arsip'].tolist() == ['001/LM', '003/LM', '004/LM']
+    assert result.data['Status'].tolist() == ['Selesai', 'Selesai', 'Proses']
+
+
+def test_appended_day_first_dates_use_the_column_format():
+    # Batch delta hanya berisi "01/02/2024": tanpa format kolom, pandas membacanya 2 Januari
+    source = FakeSheetSource(pd.DataFrame({'Nomor Arsip': ['001/LM', '002/LM'],
+                                           'Tanggal Laporan': ['15/01/2024', '20/01/2024']}))
+    sync = SheetSync(source, name="test_dayfirst")
+    sync.sync()
+    source.append([{'Nomor Arsip': '003/LM', 'Tanggal Laporan': '01/02/2024'}])
+    result = sync.sync()
+    assert result.stats['new'] == 1
+    expected = pd.to_datetime(['2024-01-15', '2024-01-20', '2024-02-01'])
+    assert result.data['Tanggal Laporan'].tolist() == list(expected)
+    # Sinkronisasi berikutnya memakai ulang snapshot yang sudah benar
+    assert sync.sync().data['Tanggal Laporan'].tolist() == list(expected)